@@ -11,6 +11,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# How long the S3 result caches keep an entry before reading it again
+S3_CACHE_TTL = dt.timedelta(days=7)
+
 
 class StormlitQueryException(Exception):
     pass
@@ -541,37 +544,41 @@ def query_s3_model_thumbnail(_conn, pilot: str, model_id: str) -> Image:
 
 
 @st.cache_data
-def query_s3_folder_names(_conn, s3_path: str, folder_name: str) -> list:
+def query_s3_element_events(_conn, pilot: str, element_id: str) -> dict:
     """
-    Query the list of folder names within a specific S3 bucket.
+    Query the stochastic storms of an HMS element and the events of each storm.
+    A single recursive listing of the element folder replaces one folder listing
+    per storm.
 
     Parameters:
         _conn (connection): A DuckDB connection object.
-        s3_path (str): The S3 path to query.
-        folder_name (str): The folder name to look for (e.g., 'event_id=', 'storm_id=').
+        pilot (str): The pilot name for the S3 bucket.
+        element_id (str): The element ID to query (e.g., 'amon-g-carter_s010').
     Returns:
-        list: A list of folder names within the specified S3 path.
+        dict: The sorted event IDs of each storm ID, keyed by storm ID in sorted order.
     """
+    s3_path = f"s3://{pilot}/cloud-hms-db/simulations/element={element_id}/"
     if s3_path_exists(s3_path):
         query = f"SELECT file FROM glob('{s3_path}**')"
         try:
-            # Fetch as list of tuples, not DataFrame
             result = _conn.execute(query).fetchall()
-            # Extract the next-level folder name after s3_path
-            event_ids = set()
-            for row in result:
-                rel = row[0][len(s3_path) :].lstrip("/")
-                if "/" in rel:
-                    folder = rel.split("/")[0]
-                    if folder_name in folder:
-                        # Extract the event ID from the folder name
-                        event = folder.split("=")[-1]
-                        event_ids.add(event)
-            return sorted(event_ids)
         except Exception as e:
             msg = f"DuckDB S3 Error: {e}"
             logger.error(msg)
             raise StormlitQueryException(msg) from e
+        events_by_storm = {}
+        for row in result:
+            # Expect storm_id=<storm>/event_id=<event>/<file> below the element
+            parts = row[0][len(s3_path) :].lstrip("/").split("/")
+            if len(parts) < 2 or "storm_id=" not in parts[0]:
+                continue
+            events = events_by_storm.setdefault(parts[0].split("=")[-1], set())
+            if len(parts) > 2 and "event_id=" in parts[1]:
+                events.add(parts[1].split("=")[-1])
+        return {
+            storm_id: sorted(events_by_storm[storm_id])
+            for storm_id in sorted(events_by_storm)
+        }
     else:
         msg = f"S3 path does not exist. Please verify the path and its contents: {s3_path}"
         logger.error(msg)
@@ -607,6 +614,95 @@ def query_s3_stochastic_hms_flow(
         return pd.DataFrame()
 
 
+# Bounded and expiring, since flow files are read per element and event. Only
+# called for files that exist, and empty reads raise, so failures are not cached.
+@st.cache_data(ttl=S3_CACHE_TTL, max_entries=1024)
+def _query_s3_hms_flow_files(_conn, event_path: str, flow_types: tuple) -> pd.DataFrame:
+    """
+    Read several stochastic HMS flow files of one event, joined on datetime.
+
+    Parameters:
+        _conn (connection): A DuckDB connection object.
+        event_path (str): The S3 path of the event folder.
+        flow_types (tuple): The flow types whose files to read (e.g., ('FLOW', 'FLOW-BASE')).
+    Returns:
+        pd.DataFrame: The time column, a flow column per flow type and a
+            '<flow_type>_read' column that is null on rows the join added.
+    """
+    sources = [
+        f'(SELECT datetime, values AS "{flow_type}", TRUE AS "{flow_type}_read" '
+        f"FROM read_parquet('{event_path}/{flow_type}.pq')) AS \"{flow_type}_ts\""
+        for flow_type in flow_types
+    ]
+    query = f"SELECT * FROM {sources[0]}" + "".join(
+        f" FULL OUTER JOIN {source} USING (datetime)" for source in sources[1:]
+    )
+    df = query_db(_conn, query)
+    if df.empty:
+        raise StormlitQueryException(f"No flow data read from {event_path}")
+    return df
+
+
+def query_s3_stochastic_hms_flows(
+    _conn,
+    pilot: str,
+    element_id: str,
+    storm_id: str,
+    event_id: str,
+    flow_cols: tuple,
+) -> dict:
+    """
+    Query several stochastic HMS flow timeseries of one event in a single query.
+    The event folder is listed once and the flow files that exist are joined on
+    datetime, so e.g. FLOW and FLOW-BASE take one round trip instead of two.
+    Missing files are logged and left to the caller to report, so this is safe
+    to call from worker threads.
+
+    Parameters:
+        _conn (connection): A DuckDB connection object.
+        pilot (str): The pilot name for the S3 bucket.
+        element_id (str): The element ID to query (e.g., 'amon-g-carter_s010').
+        storm_id (str): The storm ID to query (e.g., '19790222').
+        event_id (str): The event ID to query (e.g., '13094').
+        flow_cols (tuple): Pairs of flow type and the name to give its flow column
+            (e.g., (('FLOW', 'Hydrograph'), ('FLOW-BASE', 'Baseflow'))).
+    Returns:
+        dict: A pandas DataFrame of each flow type, keyed by flow type. Flow types
+            without data get an empty DataFrame.
+    """
+    event_path = f"s3://{pilot}/cloud-hms-db/simulations/element={element_id}/storm_id={storm_id}/event_id={event_id}"
+    fs = s3fs.S3FileSystem(anon=False)
+    try:
+        available = {path.rsplit("/", 1)[-1] for path in fs.ls(event_path)}
+    except FileNotFoundError:
+        available = set()
+    flows = {flow_type: pd.DataFrame() for flow_type, _ in flow_cols}
+    flow_types = tuple(
+        flow_type for flow_type, _ in flow_cols if f"{flow_type}.pq" in available
+    )
+    for flow_type in flows.keys() - set(flow_types):
+        logger.error(
+            f"S3 path does not exist. Please verify the path and its contents: {event_path}/{flow_type}.pq"
+        )
+    if not flow_types:
+        return flows
+    try:
+        df = _query_s3_hms_flow_files(_conn, event_path, flow_types)
+    except StormlitQueryException as e:
+        logger.error(str(e))
+        return flows
+    for flow_type, flow_col in flow_cols:
+        if flow_type not in flow_types:
+            continue
+        # Drop only the rows the join added, keeping null flows read from the file
+        flows[flow_type] = (
+            df.loc[df[f"{flow_type}_read"].notna(), ["time", flow_type]]
+            .rename(columns={flow_type: flow_col})
+            .reset_index(drop=True)
+        )
+    return flows
+
+
 @st.cache_data
 def query_s3_stochastic_ras_flow(
     _conn, pilot: str, event_id: str, model_id: str, col_id: str
@@ -678,9 +774,17 @@ def query_s3_ensemble_peak_flow(
     return query_db(_conn, query)
 
 
-@st.cache_data
+AMS_PEAK_COLUMNS = ("rank", "element", "peak_flow", "event_id", "block_group")
+
+
+# Empty reads raise rather than return, so a failed query is not cached
+@st.cache_data(ttl=S3_CACHE_TTL, max_entries=64)
 def query_s3_ams_peaks_by_element(
-    _conn, pilot: str, element_id: str, realization_id: int
+    _conn,
+    pilot: str,
+    element_id: str,
+    realization_id: int,
+    columns: tuple = AMS_PEAK_COLUMNS,
 ) -> pd.DataFrame:
     """
     Query stochastic AMS peak flow data by element from the S3 bucket.
@@ -690,18 +794,31 @@ def query_s3_ams_peaks_by_element(
         pilot (str): The pilot name for the S3 bucket.
         element_id (str): The element ID to query (e.g., 'amon-g-carter_s010').
         realization_id (int): The realization ID to query (e.g., 1).
+        columns (tuple): The columns to read, a subset of AMS_PEAK_COLUMNS.
+            Only these are read from the parquet file.
     Returns:
         pd.DataFrame: A pandas DataFrame containing the stochastic AMS peak flow data.
     """
+    invalid_columns = set(columns) - set(AMS_PEAK_COLUMNS)
+    if invalid_columns:
+        raise ValueError(f"Invalid AMS peak columns: {sorted(invalid_columns)}")
+    select = ", ".join(
+        "ROW_NUMBER() OVER (ORDER BY peak_flow DESC) AS rank" if col == "rank" else col
+        for col in columns
+    )
     s3_path = (
         f"s3://{pilot}/cloud-hms-db/ams/realization={realization_id}/ams_by_elements.pq"
     )
     if s3_path_exists(s3_path):
-        query = f"""SELECT ROW_NUMBER() OVER (ORDER BY peak_flow DESC) AS rank,
-                element, peak_flow, event_id, block_group
+        query = f"""SELECT {select}
                 FROM read_parquet('{s3_path}', hive_partitioning=true)
                 WHERE element='{element_id}';"""
-        return query_db(_conn, query)
+        df = query_db(_conn, query)
+        if df.empty:
+            msg = f"No AMS peaks found for element {element_id} in {s3_path}"
+            logger.error(msg)
+            raise StormlitQueryException(msg)
+        return df
     else:
         msg = f"S3 path does not exist. Please verify the path and its contents: {s3_path}"
         logger.error(msg)
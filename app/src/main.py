@@ -15,6 +15,12 @@ srcDir = os.path.abspath(os.path.join(currDir, "."))  # go up one level to src
 load_dotenv()
 
 
+@st.cache_resource(show_spinner=False)
+def _load_ffrd_img() -> Image.Image:
+    """Load and decode the FFRD banner image once per server process."""
+    return Image.open(os.path.join(srcDir, "assets", "ffrd.png")).copy()
+
+
 def home_page():
     st.set_page_config(page_title="stormlit", page_icon=":rain_cloud:", layout="wide")
     if "session_id" not in st.session_state:
@@ -89,10 +95,7 @@ def home_page():
 
     left_col, right_col = st.columns(2)
 
-    ffrd_path = os.path.join(srcDir, "assets", "ffrd.png")
-    ffrd_img = Image.open(ffrd_path)
-
-    right_col.image(ffrd_img, output_format="PNG")
+    right_col.image(_load_ffrd_img(), output_format="PNG")
 
     left_col.markdown(
         """
@@ -1,5 +1,5 @@
 # module imports
-from utils.session import init_session_state
+from utils.session import init_session_state, summarize_session_state
 from utils.nwis_api import query_nwis
 from db.utils import create_pg_connection, create_s3_connection
 from utils.custom import about_popover, map_popover
@@ -9,8 +9,7 @@ from utils.mapping import (
     get_gis_legend_stats,
     get_hms_legend_stats,
     get_model_subbasin,
-    get_gage_from_subbasin,
-    get_gage_from_pt_ln,
+    geojson_to_shape,
 )
 from utils.plotting import (
     plot_ts,
@@ -34,8 +33,8 @@ from utils.constants import (
 )
 from db.pull import (
     query_s3_obs_flow,
-    query_s3_stochastic_hms_flow,
-    query_s3_folder_names,
+    query_s3_stochastic_hms_flows,
+    query_s3_element_events,
     query_s3_ams_peaks_by_element,
     query_s3_gage_ams,
 )
@@ -44,13 +43,15 @@ from db.pull import (
 import os
 import logging
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 
 # third party imports
 import streamlit as st
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from urllib.parse import urljoin
-from shapely.geometry import shape
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 currDir = os.path.dirname(os.path.realpath(__file__))  # located within pages folder
 srcDir = os.path.abspath(os.path.join(currDir, ".."))  # go up one level to src
@@ -71,6 +72,251 @@ class FeatureType(Enum):
     STORM = "Storm"
 
 
+_FEATURE_TYPE_VALUES = frozenset(ft.value for ft in FeatureType)
+_PTLN_TYPES = frozenset(
+    {FeatureType.REACH, FeatureType.JUNCTION, FeatureType.RESERVOIR}
+)
+_HMS_TYPES = _PTLN_TYPES | {FeatureType.SUBBASIN}
+
+# Tables longer than this only send a preview of their first rows to the browser
+_MAX_TABLE_ROWS = 10_000
+_TABLE_PREVIEW_ROWS = 5_000
+
+
+def _build_hmsmap(bbox: list, zoom: int, c_lat: float, c_lon: float):
+    """Build the HMS map, reusing this session's map while the pilot and position hold."""
+    map_key = (st.session_state["pilot"], bbox, zoom, c_lat, c_lon)
+    cached = st.session_state.get("hms_map")
+    if cached is None or cached[0] != map_key:
+        cached = (map_key, prep_hmsmap(bbox, zoom, c_lat, c_lon))
+        st.session_state["hms_map"] = cached
+    return cached[1]
+
+
+@st.fragment
+def _render_hmsmap(bbox: list, zoom: int, c_lat: float, c_lon: float):
+    """Render the HMS map, only rerunning the full page when a new feature is clicked."""
+    with st.spinner("Loading map..."):
+        st.fmap = _build_hmsmap(bbox, zoom, c_lat, c_lon)
+        st.map_output = st.fmap.to_streamlit(
+            height=500,
+            bidirectional=True,
+        )
+    last_active_drawing = st.map_output.get("last_active_drawing", None)
+    if last_active_drawing != st.session_state["current_map_feature"]:
+        st.session_state["current_map_feature"] = last_active_drawing
+        st.rerun()
+
+
+def _script_executor(num_tasks: int) -> ThreadPoolExecutor:
+    """Create a thread pool whose workers can use Streamlit caching and elements."""
+    return ThreadPoolExecutor(
+        max_workers=max(1, min(16, num_tasks)),
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx()),
+    )
+
+
+def _query_nwis_batched(point_windows: dict) -> dict:
+    """
+    Query NWIS instantaneous flow for several gage AMS points.
+
+    Windows of the same gage that overlap are merged into a single request and
+    each point's window is sliced back out of the combined result.
+
+    Parameters
+    ----------
+    point_windows: dict
+        Mapping of point ID to a (gage_id, start_date, end_date) tuple.
+
+    Returns
+    -------
+    dict
+        Mapping of point ID to its NWIS flow DataFrame.
+    """
+    # Group the windows by gage and merge the overlapping ones
+    requests = []
+    for point, (gage_id, start_date, end_date) in sorted(
+        point_windows.items(), key=lambda item: item[1]
+    ):
+        if (
+            requests
+            and requests[-1]["gage_id"] == gage_id
+            and start_date <= requests[-1]["end_date"]
+        ):
+            requests[-1]["end_date"] = max(requests[-1]["end_date"], end_date)
+            requests[-1]["points"].append(point)
+        else:
+            requests.append(
+                {
+                    "gage_id": gage_id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "points": [point],
+                }
+            )
+    with _script_executor(len(requests)) as executor:
+        results = executor.map(
+            lambda request: query_nwis(
+                site=request["gage_id"],
+                parameter="Streamflow",
+                start_date=request["start_date"],
+                end_date=request["end_date"],
+                data_type="iv",
+                reference_df=pd.DataFrame(),
+            ),
+            requests,
+        )
+        nwis_dfs = list(results)
+    point_flows = {}
+    for request, nwis_df in zip(requests, nwis_dfs):
+        if nwis_df.empty or len(request["points"]) == 1:
+            for point in request["points"]:
+                point_flows[point] = nwis_df
+            continue
+        # NWIS date windows are inclusive days in the site's local time
+        nwis_dates = nwis_df["datetime"].str[:10]
+        for point in request["points"]:
+            _, start_date, end_date = point_windows[point]
+            point_flows[point] = nwis_df[
+                (nwis_dates >= start_date) & (nwis_dates <= end_date)
+            ].copy()
+    return point_flows
+
+
+def _fetch_point_flows(selected_points: dict, has_baseflow: bool) -> tuple:
+    """
+    Fetch the time series for the points selected from the AEP plot.
+
+    Gage points and stochastic points are partitioned up front and every S3
+    query is issued concurrently, with one query per stochastic point. Gages
+    missing from S3 fall back to a batched NWIS query.
+
+    Parameters
+    ----------
+    selected_points: dict
+        The points returned by plot_flow_aep, keyed by point ID.
+    has_baseflow: bool
+        Whether baseflows should also be fetched for the stochastic points.
+
+    Returns
+    -------
+    tuple
+        Dicts of flow and baseflow DataFrames keyed by point ID.
+    """
+    s3_conn = st.session_state["s3_conn"]
+    pilot_bucket = st.session_state["pilot_bucket"]
+    hms_element_id = st.session_state["hms_element_id"]
+    gage_points = {
+        point: point_meta
+        for point, point_meta in selected_points.items()
+        if "gage_id" in point_meta
+    }
+    stochastic_points = {
+        point: point_meta
+        for point, point_meta in selected_points.items()
+        if "gage_id" not in point_meta
+    }
+    # Each stochastic point reads its flow and baseflow in a single query
+    flow_cols = (("FLOW", "hms_flow"),)
+    if has_baseflow:
+        flow_cols += (("FLOW-BASE", "hms_flow"),)
+    num_tasks = len(gage_points) + len(stochastic_points)
+    with _script_executor(num_tasks) as executor:
+        gage_futures = {
+            point: executor.submit(
+                query_s3_obs_flow,
+                s3_conn.cursor(),
+                pilot_bucket,
+                point_meta["gage_id"],
+                point_meta["storm_id"],
+            )
+            for point, point_meta in gage_points.items()
+        }
+        stochastic_futures = {
+            point: executor.submit(
+                query_s3_stochastic_hms_flows,
+                s3_conn.cursor(),
+                pilot_bucket,
+                hms_element_id,
+                point_meta["storm_id"],
+                point_meta["event_id"],
+                flow_cols,
+            )
+            for point, point_meta in stochastic_points.items()
+        }
+        flows = {point: future.result() for point, future in gage_futures.items()}
+        # Fall back to NWIS instantaneous values for gages missing from S3,
+        # while the stochastic S3 queries are still in flight
+        missing_points = [point for point in gage_points if flows[point].empty]
+        if missing_points:
+            # Build the +/- 1 day windows around every missing peak at once
+            peak_times = pd.Series(
+                [gage_points[point]["peak_time"] for point in missing_points],
+                index=missing_points,
+            )
+            one_day = pd.Timedelta(days=1)
+            start_dates = (peak_times - one_day).dt.strftime("%Y-%m-%d")
+            end_dates = (peak_times + one_day).dt.strftime("%Y-%m-%d")
+            nwis_windows = {
+                point: (
+                    gage_points[point]["gage_id"],
+                    start_dates[point],
+                    end_dates[point],
+                )
+                for point in missing_points
+            }
+            flows.update(_query_nwis_batched(nwis_windows))
+    baseflows = {}
+    for point, future in stochastic_futures.items():
+        point_flows = future.result()
+        flows[point] = point_flows["FLOW"]
+        if has_baseflow:
+            baseflows[point] = point_flows["FLOW-BASE"]
+    return flows, baseflows
+
+
+def _concat_frames(frames: list) -> pd.DataFrame | None:
+    """
+    Concatenate the per-point time series frames.
+
+    A single frame is returned as is. Frames that share the same NumPy backed
+    schema are stitched together column by column with np.concatenate, skipping
+    the generic pd.concat machinery. Anything else, such as Arrow backed or
+    mixed schemas, falls back to pd.concat.
+
+    Parameters
+    ----------
+    frames: list
+        The DataFrames to concatenate.
+
+    Returns
+    -------
+    pd.DataFrame | None
+        The concatenated DataFrame, or None if there are no frames.
+    """
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return frames[0]
+    first = frames[0]
+    uniform = all(isinstance(dtype, np.dtype) for dtype in first.dtypes) and all(
+        frame.columns.equals(first.columns) and frame.dtypes.equals(first.dtypes)
+        for frame in frames[1:]
+    )
+    if not uniform:
+        return pd.concat(frames, ignore_index=False, copy=False)
+    data = {
+        col: np.concatenate([frame[col].to_numpy() for frame in frames])
+        for col in first.columns
+    }
+    index = pd.Index(
+        np.concatenate([frame.index.to_numpy() for frame in frames]),
+        name=first.index.name,
+    )
+    return pd.DataFrame(data, index=index)
+
+
 def calibration_events():
     st.write("Coming soon...")
     st.session_state["stochastic_event"] = None
@@ -81,91 +327,87 @@ def stochastic_events(
     col_storm_id, col_event_id, info_col, feature_type, feature_label
 ):
     """Handle stochastic events selection and display."""
-    if st.session_state["hms_element_id"] is None:
+    s3_conn = st.session_state["s3_conn"]
+    pilot_bucket = st.session_state["pilot_bucket"]
+    element_id = st.session_state["hms_element_id"]
+    if element_id is None:
         st.warning(
             "Please select a HEC-HMS model object from the map or drop down list"
         )
     else:
-        stochastic_storms = query_s3_folder_names(
-            st.session_state["s3_conn"],
-            s3_path=f"s3://{st.session_state['pilot_bucket']}/cloud-hms-db/simulations/element={st.session_state['hms_element_id']}/",
-            folder_name="storm_id=",
-        )
-        st.session_state["stochastic_storm"] = col_storm_id.selectbox(
+        # One listing of the element gives the events of every storm
+        events_by_storm = query_s3_element_events(s3_conn, pilot_bucket, element_id)
+        storm_id = col_storm_id.selectbox(
             "Select Storm ID",
-            sorted(stochastic_storms),
+            list(events_by_storm),
             index=None,
         )
-        if st.session_state["stochastic_storm"] is None:
+        st.session_state["stochastic_storm"] = storm_id
+        if storm_id is None:
             st.warning("Please select a stochastic storm.")
         else:
-            stochastic_events = query_s3_folder_names(
-                st.session_state["s3_conn"],
-                s3_path=f"s3://{st.session_state['pilot_bucket']}/cloud-hms-db/simulations/element={st.session_state['hms_element_id']}/storm_id={st.session_state['stochastic_storm']}/",
-                folder_name="event_id=",
-            )
             st.session_state["stochastic_event"] = col_event_id.selectbox(
                 "Select Event ID",
-                sorted(stochastic_events),
+                events_by_storm[storm_id],
                 index=None,
             )
             if st.session_state["stochastic_event"] is None:
                 st.warning("Please select a stochastic event.")
-    if (
-        st.session_state["stochastic_event"] is not None
-        and st.session_state["stochastic_storm"] is not None
-    ):
-        stochastic_flow_ts = query_s3_stochastic_hms_flow(
-            st.session_state["s3_conn"],
-            st.session_state["pilot_bucket"],
-            st.session_state["hms_element_id"],
-            st.session_state["stochastic_storm"],
-            st.session_state["stochastic_event"],
-            flow_type="FLOW",
+    storm_id = st.session_state["stochastic_storm"]
+    event_id = st.session_state["stochastic_event"]
+    if event_id is not None and storm_id is not None:
+        has_baseflow = feature_type == FeatureType.SUBBASIN
+        # Read the flow and baseflow of the event in a single query
+        flow_cols = (("FLOW", "Hydrograph"),)
+        if has_baseflow:
+            flow_cols += (("FLOW-BASE", "Baseflow"),)
+        stochastic_flows = query_s3_stochastic_hms_flows(
+            s3_conn, pilot_bucket, element_id, storm_id, event_id, flow_cols
         )
-        stochastic_flow_ts.rename(columns={"hms_flow": "Hydrograph"}, inplace=True)
-        if feature_type == FeatureType.SUBBASIN:
-            stochastic_baseflow_ts = query_s3_stochastic_hms_flow(
-                st.session_state["s3_conn"],
-                st.session_state["pilot_bucket"],
-                st.session_state["hms_element_id"],
-                st.session_state["stochastic_storm"],
-                st.session_state["stochastic_event"],
-                flow_type="FLOW-BASE",
-            )
-            stochastic_baseflow_ts.rename(
-                columns={"hms_flow": "Baseflow"}, inplace=True
-            )
+        for flow_type, flow_col in flow_cols:
+            if stochastic_flows[flow_type].empty:
+                st.warning(
+                    f"No {flow_col} data found for storm {storm_id}, event {event_id}."
+                )
+        stochastic_flow_ts = stochastic_flows["FLOW"]
+        if has_baseflow:
+            stochastic_baseflow_ts = stochastic_flows["FLOW-BASE"]
         else:
             stochastic_baseflow_ts = pd.DataFrame()
             st.markdown("Baseflow is not available for this HMS element. ")
         info_col.markdown("### Modeled Flow")
-        with info_col.expander("Plots", expanded=False, icon="📈"):
-            plot_ts(
-                stochastic_flow_ts,
-                stochastic_baseflow_ts,
-                "Hydrograph",
-                "Baseflow",
-                dual_y_axis=False,
-                plot_title=feature_label,
-                y_axis01_title=FLOW_LABEL,
-            )
-        with info_col.expander("Tables", expanded=False, icon="🔢"):
-            st.markdown("#### Modeled Hydrograph")
-            st.dataframe(stochastic_flow_ts)
-            st.markdown("#### Modeled Baseflow")
-            st.dataframe(stochastic_baseflow_ts)
+        # Only build the figure and tables once the user asks for them
+        if info_col.toggle("📈 Show Plots", key="stochastic_plots_open"):
+            with info_col.expander("Plots", expanded=True, icon="📈"):
+                plot_ts(
+                    stochastic_flow_ts,
+                    stochastic_baseflow_ts,
+                    "Hydrograph",
+                    "Baseflow",
+                    dual_y_axis=False,
+                    plot_title=feature_label,
+                    y_axis01_title=FLOW_LABEL,
+                )
+        if info_col.toggle("🔢 Show Tables", key="stochastic_tables_open"):
+            with info_col.expander("Tables", expanded=True, icon="🔢"):
+                st.markdown("#### Modeled Hydrograph")
+                st.dataframe(stochastic_flow_ts)
+                st.markdown("#### Modeled Baseflow")
+                st.dataframe(stochastic_baseflow_ts)
 
 
 def multi_events(available_gage_ids, col_storm_id, info_col, feature_type):
     """Handle multi events selection and display."""
-    if st.session_state["hms_element_id"] is None:
+    s3_conn = st.session_state["s3_conn"]
+    pilot_bucket = st.session_state["pilot_bucket"]
+    element_id = st.session_state["hms_element_id"]
+    if element_id is None:
         st.warning(
             "Please select a HEC-HMS model object from the map or drop down list"
         )
     else:
         if available_gage_ids is not None:
-            st.session_state["multi_event_gage_id"] = col_storm_id.selectbox(
+            gage_id = col_storm_id.selectbox(
                 "Select Gage ID",
                 available_gage_ids,
                 index=0,
@@ -174,41 +416,40 @@ def multi_events(available_gage_ids, col_storm_id, info_col, feature_type):
             col_storm_id.warning(
                 "The selected HEC-HMS element is not associated with any gages."
             )
-            gage_ams_df = None
-            st.session_state["multi_event_gage_id"] = None
+            gage_id = None
+        st.session_state["multi_event_gage_id"] = gage_id
 
         multi_event_ams_df = query_s3_ams_peaks_by_element(
-            st.session_state["s3_conn"],
-            st.session_state["pilot_bucket"],
-            st.session_state["hms_element_id"],
+            s3_conn,
+            pilot_bucket,
+            element_id,
             realization_id=1,
+            # The element is already known, skip reading it back for every peak
+            columns=("rank", "peak_flow", "event_id", "block_group"),
         )
-        multi_event_ams_df["aep"] = multi_event_ams_df["rank"] / (
-            len(multi_event_ams_df)
-        )
-        multi_event_ams_df["return_period"] = 1 / multi_event_ams_df["aep"]
-        multi_event_ams_df = pd.merge(
-            multi_event_ams_df,
-            st.hms_storms,
-            left_on="event_id",
-            right_on="event_id",
-            how="left",
+        rank = multi_event_ams_df["rank"].to_numpy()
+        aep = rank / rank.size
+        multi_event_ams_df["aep"] = aep
+        multi_event_ams_df["return_period"] = np.reciprocal(aep)
+        # Look up each event's storm columns against the event-indexed storms
+        event_ids = multi_event_ams_df["event_id"]
+        multi_event_ams_df = multi_event_ams_df.assign(
+            **{
+                col: event_ids.map(st.hms_storms_by_id[col])
+                for col in st.hms_storms_by_id.columns
+            }
         )
-        multi_event_ams_df["storm_id"] = pd.to_datetime(
-            multi_event_ams_df["storm_id"]
-        ).dt.strftime("%Y-%m-%d")
-
-        if st.session_state["multi_event_gage_id"] is not None:
-            gage_ams_df = query_s3_gage_ams(
-                st.session_state["s3_conn"],
-                st.session_state["pilot_bucket"],
-                st.session_state["multi_event_gage_id"],
+        multi_event_ams_df["storm_id"] = pd.to_datetime(multi_event_ams_df["storm_id"])
+
+        if gage_id is not None:
+            gage_ams_df = query_s3_gage_ams(s3_conn, pilot_bucket, gage_id)
+            num_peaks = len(gage_ams_df)
+            gage_rank = gage_ams_df["rank"].to_numpy()
+            gage_ams_df = gage_ams_df.assign(
+                aep=gage_rank / num_peaks,
+                return_period=num_peaks / gage_rank,
+                peak_time=pd.to_datetime(gage_ams_df["peak_time"]),
             )
-            gage_ams_df["aep"] = gage_ams_df["rank"] / (len(gage_ams_df))
-            gage_ams_df["return_period"] = 1 / gage_ams_df["aep"]
-            gage_ams_df["peak_time"] = pd.to_datetime(
-                gage_ams_df["peak_time"]
-            ).dt.strftime("%Y-%m-%d")
         else:
             gage_ams_df = None
         with info_col.expander("Plots", expanded=True, icon="📈"):
@@ -221,129 +462,119 @@ def multi_events(available_gage_ids, col_storm_id, info_col, feature_type):
             if selected_points:
                 multi_events_flows = []
                 multi_events_baseflows = []
-                for point in selected_points:
-                    if "gage_id" in selected_points[point]:
-                        gage_flow_ts = query_s3_obs_flow(
-                            st.session_state["s3_conn"],
-                            st.session_state["pilot_bucket"],
-                            selected_points[point]["gage_id"],
-                            selected_points[point]["storm_id"],
-                        )
-                        if not gage_flow_ts.empty:
-                            gage_flow_ts["block_id"] = point
-                            gage_flow_ts["storm_id"] = selected_points[point][
-                                "storm_id"
-                            ]
-                            gage_flow_ts["event_id"] = selected_points[point][
-                                "event_id"
-                            ]
-                            multi_events_flows.append(gage_flow_ts)
-                        else:
-                            peak_time = selected_points[point]["peak_time"]
-                            peak_time_dt = pd.to_datetime(
-                                peak_time,
-                                format="%Y-%m-%d",
-                                errors="coerce",
-                            )
-                            start_date = (peak_time_dt - pd.Timedelta(days=1)).strftime(
-                                "%Y-%m-%d"
-                            )
-                            end_date = (peak_time_dt + pd.Timedelta(days=1)).strftime(
-                                "%Y-%m-%d"
-                            )
-                            # try getting instantaneous values from the NWIS
-                            gage_flow_ts = query_nwis(
-                                site=selected_points[point]["gage_id"],
-                                parameter="Streamflow",
-                                start_date=start_date,
-                                end_date=end_date,
-                                data_type="iv",
-                                reference_df=pd.DataFrame(),
-                            )
-                            if not gage_flow_ts.empty:
-                                gage_flow_ts["block_id"] = point
-                                gage_flow_ts["storm_id"] = selected_points[point][
-                                    "storm_id"
-                                ]
-                                gage_flow_ts["event_id"] = selected_points[point][
-                                    "event_id"
-                                ]
-                                multi_events_flows.append(gage_flow_ts)
-                    else:
-                        # Get the Stochastic Hydrographs
-                        stochastic_flow_ts = query_s3_stochastic_hms_flow(
-                            st.session_state["s3_conn"],
-                            st.session_state["pilot_bucket"],
-                            st.session_state["hms_element_id"],
-                            selected_points[point]["storm_id"],
-                            selected_points[point]["event_id"],
-                            flow_type="FLOW",
-                        )
-                        stochastic_flow_ts["block_id"] = point
-                        stochastic_flow_ts["storm_id"] = selected_points[point][
-                            "storm_id"
-                        ]
-                        stochastic_flow_ts["event_id"] = selected_points[point][
-                            "event_id"
-                        ]
-                        multi_events_flows.append(stochastic_flow_ts)
-                        if feature_type == FeatureType.SUBBASIN:
-                            # Get the Stochastic Baseflows
-                            stochastic_baseflow_ts = query_s3_stochastic_hms_flow(
-                                st.session_state["s3_conn"],
-                                st.session_state["pilot_bucket"],
-                                st.session_state["hms_element_id"],
-                                selected_points[point]["storm_id"],
-                                selected_points[point]["event_id"],
-                                flow_type="FLOW-BASE",
-                            )
-                            stochastic_baseflow_ts["block_id"] = point
-                            stochastic_baseflow_ts["storm_id"] = selected_points[point][
-                                "storm_id"
-                            ]
-                            stochastic_baseflow_ts["event_id"] = selected_points[point][
-                                "event_id"
-                            ]
-                            multi_events_baseflows.append(stochastic_baseflow_ts)
-                        else:
+                flows, baseflows = _fetch_point_flows(
+                    selected_points, feature_type == FeatureType.SUBBASIN
+                )
+                # Collect the results in selection order
+                for point, point_meta in selected_points.items():
+                    flow_ts = flows[point]
+                    is_gage = "gage_id" in point_meta
+                    if flow_ts.empty:
+                        if not is_gage:
                             st.warning(
-                                "Baseflow is not available for this HMS element."
+                                f"No flow data found for storm {point_meta['storm_id']}"
+                                f", event {point_meta['event_id']}."
                             )
-                if len(multi_events_flows) > 0:
-                    multi_events_flows_df = pd.concat(
-                        multi_events_flows,
-                        ignore_index=False,
-                    )
-                if len(multi_events_baseflows) > 0:
-                    multi_events_baseflows_df = pd.concat(
-                        multi_events_baseflows,
-                        ignore_index=False,
-                    )
-                if (
-                    multi_events_flows_df is not None
-                    and multi_events_baseflows_df is None
-                ):
-                    plot_multi_event_ts(multi_events_flows_df, pd.DataFrame())
-                elif (
-                    multi_events_flows_df is not None
-                    and multi_events_baseflows_df is not None
-                ):
+                        continue
+                    tags = {
+                        "block_id": point,
+                        "storm_id": point_meta["storm_id"],
+                        "event_id": point_meta["event_id"],
+                    }
+                    multi_events_flows.append(flow_ts.assign(**tags))
+                    if is_gage:
+                        continue
+                    if point in baseflows:
+                        multi_events_baseflows.append(baseflows[point].assign(**tags))
+                    else:
+                        st.warning("Baseflow is not available for this HMS element.")
+                multi_events_flows_df = _concat_frames(multi_events_flows)
+                multi_events_baseflows_df = _concat_frames(multi_events_baseflows)
+                if multi_events_flows_df is not None:
                     plot_multi_event_ts(
                         multi_events_flows_df, multi_events_baseflows_df
                     )
 
-        with info_col.expander("Tables", expanded=False, icon="🔢"):
+        with info_col:
+            _multi_event_tables(
+                multi_event_ams_df,
+                gage_ams_df,
+                multi_events_flows_df,
+                multi_events_baseflows_df,
+            )
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV once per unique frame for downloading."""
+    return df.to_csv().encode()
+
+
+def _preview_dataframe(df: pd.DataFrame, name: str):
+    """
+    Display a DataFrame, truncated to its first rows when it is large.
+
+    Large tables only send a preview to the browser and offer the full table
+    as a CSV download instead.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The DataFrame to display.
+    name: str
+        The name of the table, used for the download file and widget key.
+    """
+    num_rows = len(df)
+    if num_rows <= _MAX_TABLE_ROWS:
+        st.dataframe(df)
+        return
+    st.dataframe(df.head(_TABLE_PREVIEW_ROWS))
+    st.caption(f"Showing {_TABLE_PREVIEW_ROWS:,} of {num_rows:,} rows")
+    st.download_button(
+        "⬇️ Download Full CSV",
+        _to_csv_bytes(df),
+        file_name=f"{name}.csv",
+        mime="text/csv",
+        key=f"download_{name}",
+    )
+
+
+@st.fragment
+def _multi_event_tables(
+    multi_event_ams_df, gage_ams_df, multi_events_flows_df, multi_events_baseflows_df
+):
+    """
+    Render the multi event tables.
+
+    Running as a fragment means toggling the tables only reruns this function
+    instead of the whole page, and the tables are only serialized once the user
+    asks for them.
+    """
+    if st.toggle("🔢 Show Tables", key="multi_event_tables_open"):
+        with st.expander("Tables", expanded=True, icon="🔢"):
             st.markdown("#### Multi Event AMS Data")
-            st.dataframe(multi_event_ams_df)
+            st.dataframe(
+                multi_event_ams_df,
+                column_config={
+                    "storm_id": st.column_config.DatetimeColumn(format="YYYY-MM-DD")
+                },
+            )
             if gage_ams_df is not None:
                 st.markdown("#### Gage AMS Data")
-                st.dataframe(gage_ams_df)
+                st.dataframe(
+                    gage_ams_df,
+                    column_config={
+                        "peak_time": st.column_config.DatetimeColumn(
+                            format="YYYY-MM-DD"
+                        )
+                    },
+                )
             if multi_events_flows_df is not None:
                 st.markdown("#### Multi Event Hydrographs")
-                st.dataframe(multi_events_flows_df)
+                _preview_dataframe(multi_events_flows_df, "multi_event_hydrographs")
             if multi_events_baseflows_df is not None:
                 st.markdown("#### Multi Event Baseflows")
-                st.dataframe(multi_events_baseflows_df)
+                _preview_dataframe(multi_events_baseflows_df, "multi_event_baseflows")
 
 
 def hms_results():
@@ -391,21 +622,9 @@ def hms_results():
     if st.session_state["s3_connected"] is False:
         st.session_state["s3_conn"] = create_s3_connection()
 
-    # Initialize session state variables if not already set
-    if st.session_state["init_hms_pilot"] is False:
-        with st.spinner("Initializing HMS datasets..."):
-            init_hms_pilot(
-                st.session_state["s3_conn"],
-                st.session_state["pilot_bucket"],
-            )
-            st.session_state["init_hms_pilot"] = True
-    elif "Gages" not in st.pilot_layers:
-        with st.spinner("Initializing HMS datasets..."):
-            init_hms_pilot(
-                st.session_state["s3_conn"],
-                st.session_state["pilot_bucket"],
-            )
-            st.session_state["init_hms_pilot"] = True
+    # Bind the process-wide HMS datasets, loading them on first use
+    init_hms_pilot(st.session_state["s3_conn"], st.session_state["pilot_bucket"])
+    st.session_state["init_hms_pilot"] = True
     dropdown_container = st.container(
         key="dropdown_container",
     )
@@ -427,7 +646,7 @@ def hms_results():
     # Get the feature type from session state or default to None to determine how to display the map
     feature_type = st.session_state.get("single_event_focus_feature_type")
     if feature_type is not None:
-        if feature_type not in FeatureType:
+        if feature_type not in _FEATURE_TYPE_VALUES:
             reset_selections()
             st.rerun()
         else:
@@ -435,13 +654,7 @@ def hms_results():
 
     bbox = st.session_state.get("single_event_focus_bounding_box")
     with map_col:
-        with st.spinner("Loading map..."):
-            # Use map_version as key to force re-render on reset
-            st.fmap = prep_hmsmap(bbox, zoom, c_lat, c_lon)
-            st.map_output = st.fmap.to_streamlit(
-                height=500,
-                bidirectional=True,
-            )
+        _render_hmsmap(bbox, zoom, c_lat, c_lon)
 
     # Handle when a feature is selected from the map
     last_active_drawing = st.map_output.get("last_active_drawing", None)
@@ -453,18 +666,14 @@ def hms_results():
         geom = last_active_drawing.get("geometry", None)
         st.session_state["current_map_feature"] = last_active_drawing
         if geom and isinstance(geom, dict):
-            geom = shape(geom)
+            geom = geojson_to_shape(geom)
         if layer:
             feature_type = FeatureType(layer)
             if feature_type == FeatureType.SUBBASIN:
                 feature_id = properties["hms_element"]
                 feature_label = feature_id
                 st.session_state["subbasin_id"] = feature_id
-            elif feature_type in (
-                FeatureType.REACH,
-                FeatureType.JUNCTION,
-                FeatureType.RESERVOIR,
-            ):
+            elif feature_type in _PTLN_TYPES:
                 feature_id = properties["hms_element"]
                 feature_label = feature_id
                 st.session_state["subbasin_id"] = get_model_subbasin(
@@ -552,12 +761,7 @@ def hms_results():
                         else:
                             st.error(f"Error retrieving {plot_type} image.")
         # HEC-HMS Model Objects
-        elif feature_type in [
-            FeatureType.SUBBASIN,
-            FeatureType.REACH,
-            FeatureType.JUNCTION,
-            FeatureType.RESERVOIR,
-        ]:
+        elif feature_type in _HMS_TYPES:
             st.session_state["hms_element_id"] = feature_label
             st.markdown(f"### Subbasin: `{st.session_state['subbasin_id']}`")
             if feature_type != FeatureType.SUBBASIN:
@@ -576,32 +780,7 @@ def hms_results():
                 [CALIB_EVENTS, STOCHASTIC_EVENTS, MULTI_EVENTS],
                 index=0,
             )
-            if feature_type == FeatureType.SUBBASIN:
-                available_gage_ids = get_gage_from_subbasin(
-                    st.subbasins.loc[st.subbasins["hms_element"] == feature_label][
-                        "geometry"
-                    ]
-                )
-            elif feature_type == FeatureType.REACH:
-                available_gage_ids = get_gage_from_pt_ln(
-                    st.reaches.loc[st.reaches["hms_element"] == feature_label][
-                        "geometry"
-                    ]
-                )
-            elif feature_type == FeatureType.JUNCTION:
-                available_gage_ids = get_gage_from_pt_ln(
-                    st.junctions.loc[st.junctions["hms_element"] == feature_label][
-                        "geometry"
-                    ]
-                )
-            elif feature_type == FeatureType.RESERVOIR:
-                available_gage_ids = get_gage_from_pt_ln(
-                    st.reservoirs.loc[st.reservoirs["hms_element"] == feature_label][
-                        "geometry"
-                    ]
-                )
-            else:
-                available_gage_ids = None
+            available_gage_ids = st.gages_by_element.get(feature_label)
 
             if st.session_state["event_type"] == STOCHASTIC_EVENTS:
                 stochastic_events(
@@ -625,20 +804,19 @@ def hms_results():
 
     with dropdown_container:
         if st.session_state["subbasin_id"] is not None:
-            selected_subbasin = st.subbasins[
-                st.subbasins["hms_element"] == st.session_state["subbasin_id"]
-            ]
+            # Look up the selected subbasin geometry once for all four layers
+            model_geom = st.subbasin_geom_by_id.get(st.session_state["subbasin_id"])
             num_subbasins = get_hms_legend_stats(
-                selected_subbasin, st.subbasins, "subbasins_filtered"
+                model_geom, st.subbasins, "subbasins_filtered"
             )
             num_reaches = get_hms_legend_stats(
-                selected_subbasin, st.reaches, "reaches_filtered"
+                model_geom, st.reaches, "reaches_filtered"
             )
             num_junctions = get_hms_legend_stats(
-                selected_subbasin, st.junctions, "junctions_filtered"
+                model_geom, st.junctions, "junctions_filtered"
             )
             num_reservoirs = get_hms_legend_stats(
-                selected_subbasin, st.reservoirs, "reservoirs_filtered"
+                model_geom, st.reservoirs, "reservoirs_filtered"
             )
             num_gages = get_gis_legend_stats(
                 st.gages,
@@ -646,6 +824,7 @@ def hms_results():
                 st.subbasins,
                 "hms_element",
                 st.session_state["subbasin_id"],
+                area_geom=model_geom,
             )
             num_dams = get_gis_legend_stats(
                 st.dams,
@@ -653,72 +832,57 @@ def hms_results():
                 st.subbasins,
                 "hms_element",
                 st.session_state["subbasin_id"],
+                area_geom=model_geom,
             )
 
     # Dropdowns for each feature type
     with col_subbasins:
         map_popover(
             "🟦 Subbasins",
-            st.subbasins.to_dict("records"),
-            lambda subbasin: subbasin["hms_element"],
-            get_item_id=lambda subbasin: subbasin["hms_element"],
+            st.subbasins,
             feature_type=FeatureType.SUBBASIN,
+            key_column="hms_element",
             image_path=os.path.join(assetsDir, "subbasins_icon.png"),
         )
     with col_reaches:
         map_popover(
             "🟪 Reaches",
-            {}
-            if st.session_state["reaches_filtered"] is None
-            else st.session_state["reaches_filtered"].to_dict("records"),
-            lambda reach: reach["hms_element"],
-            get_item_id=lambda reach: reach["hms_element"],
+            st.session_state["reaches_filtered"],
             feature_type=FeatureType.REACH,
+            key_column="hms_element",
             image_path=os.path.join(assetsDir, "reaches_icon.png"),
         )
     with col_junctions:
         map_popover(
             "🟫 Junctions",
-            {}
-            if st.session_state["junctions_filtered"] is None
-            else st.session_state["junctions_filtered"].to_dict("records"),
-            lambda junction: junction["hms_element"],
-            get_item_id=lambda junction: junction["hms_element"],
+            st.session_state["junctions_filtered"],
             feature_type=FeatureType.JUNCTION,
+            key_column="hms_element",
             image_path=os.path.join(assetsDir, "reaches_icon.png"),
         )
     with col_reservoirs:
         map_popover(
             "⬛ Reservoirs",
-            {}
-            if st.session_state["reservoirs_filtered"] is None
-            else st.session_state["reservoirs_filtered"].to_dict("records"),
-            lambda reservoir: reservoir["hms_element"],
-            get_item_id=lambda reservoir: reservoir["hms_element"],
+            st.session_state["reservoirs_filtered"],
             feature_type=FeatureType.RESERVOIR,
+            key_column="hms_element",
             image_path=os.path.join(assetsDir, "reaches_icon.png"),
         )
     with col_gages:
         map_popover(
             "🟩 Gages",
-            {}
-            if st.session_state["gages_filtered"] is None
-            else st.session_state["gages_filtered"].to_dict("records"),
-            lambda gage: gage["site_no"],
-            get_item_id=lambda gage: gage["site_no"],
+            st.session_state["gages_filtered"],
             feature_type=FeatureType.GAGE,
+            key_column="site_no",
             download_url=st.pilot_layers["Gages"],
             image_path=os.path.join(assetsDir, "gage_icon.png"),
         )
     with col_dams:
         map_popover(
             "🟥 Dams",
-            {}
-            if st.session_state["dams_filtered"] is None
-            else st.session_state["dams_filtered"].to_dict("records"),
-            lambda dam: dam["id"],
-            get_item_id=lambda dam: dam["id"],
+            st.session_state["dams_filtered"],
             feature_type=FeatureType.DAM,
+            key_column="id",
             download_url=st.pilot_layers["Dams"],
             image_path=os.path.join(assetsDir, "dam_icon.jpg"),
         )
@@ -771,9 +935,9 @@ def hms_results():
                 """
             )
 
-    if os.getenv("SHOW_SESSION_STATE") is True:
+    if os.getenv("SHOW_SESSION_STATE") == "True":
         with st.expander("Session State", expanded=False):
-            st.json(st.session_state)
+            st.json(summarize_session_state())
 
 
 if __name__ == "__main__":
@@ -32,6 +32,16 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+# The AORC statistics and transform are shown in the Metadata tab instead
+_STORM_TABLE_COLUMNS = [
+    "rank",
+    "collection",
+    "storm_type",
+    "datetime",
+    "aorc_storm_href",
+]
+
+
 class FeatureType(Enum):
     MODEL = "Model"
     STORM = "Storm"
@@ -48,20 +58,17 @@ def _get_selected_row(event, table_key):
     return rows[0] if rows else None
 
 
-def _update_selected_storm(storms_df, row_idx, aorc_storm_href):
-    if storms_df is None or row_idx is None or row_idx >= len(storms_df):
-        return
-    storm_id = int(storms_df.iloc[row_idx]["rank"])
-    storm_date = storms_df.iloc[row_idx]["datetime"]
+def _update_selected_storm(storm_row):
+    storm_id = int(storm_row["rank"])
     st.session_state.update(
         {
             "hydromet_storm_id": storm_id,
-            "hydromet_storm_date": storm_date,
+            "hydromet_storm_date": storm_row["datetime"],
             "single_event_focus_feature_type": FeatureType.STORM.value,
             "single_event_focus_feature_id": storm_id,
-            "aorc_storm_href": aorc_storm_href,
-            "aorc:statistics": storms_df.iloc[row_idx].get("aorc_statistics", None),
-            "aorc:transform": storms_df.iloc[row_idx].get("aorc_transform", None),
+            "aorc_storm_href": storm_row.get("aorc_storm_href"),
+            "aorc:statistics": storm_row.get("aorc_statistics", None),
+            "aorc:transform": storm_row.get("aorc_transform", None),
         }
     )
 
@@ -69,16 +76,291 @@ def _update_selected_storm(storms_df, row_idx, aorc_storm_href):
 def _handle_storm_select(event=None):
     row_idx = _get_selected_row(event, "storms_table_rank")
     storms_df = st.session_state.get("storms_df_rank")
-    aorc_storm_href = None
-    if storms_df is not None and row_idx is not None and row_idx < len(storms_df):
-        aorc_storm_href = storms_df.iloc[row_idx].get("aorc_storm_href")
-    _update_selected_storm(storms_df, row_idx, aorc_storm_href)
+    if storms_df is None or row_idx is None or row_idx >= len(storms_df):
+        return
+    # Materialize the selected row once instead of once per field
+    _update_selected_storm(storms_df.iloc[row_idx])
+
+
+def _build_hyeto_fig(aorc_storm_href, points):
+    """
+    Build the hyetograph figure for the selected storm's map points.
+
+    A point's hyetograph only depends on the storm dataset and its key, so the
+    session keeps its latest figure and only rebuilds it when a point is added.
+
+    Parameters
+    ----------
+    aorc_storm_href: str
+        The icechunk s3 href of the selected storm.
+    points: tuple
+        The (lat, lon, storm_id) hyetograph cache keys to plot, in order.
+
+    Returns
+    -------
+    go.Figure
+        The hyetograph figure.
+    """
+    fig_key = (aorc_storm_href, points)
+    cached = st.session_state.get("hyeto_fig")
+    if cached is not None and cached[0] == fig_key:
+        return cached[1]
+    hyeto_df_cache = st.session_state["hyeto_df_cache"]
+    fig = go.Figure()
+    for key in points:
+        lat, lon, _ = key
+        hyeto_df, x_col, _ = hyeto_df_cache[key]
+        fig.add_trace(
+            go.Scatter(
+                x=hyeto_df[x_col].to_numpy(),
+                y=hyeto_df["precip_in"].to_numpy(),
+                mode="lines+markers",
+                name=f"Lat {lat:.4f}, Lon {lon:.4f}",
+            )
+        )
+
+    fig.update_layout(
+        title="Hyetographs",
+        xaxis_title="Time",
+        yaxis_title="Precipitation (inches)",
+        margin=dict(l=20, r=20, t=40, b=20),
+        legend_title_text="Locations",
+    )
+    st.session_state["hyeto_fig"] = (fig_key, fig)
+    return fig
+
+
+# The HTML embeds every frame, so only the most recent storms are kept
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_storm_animation_html(aorc_storm_href, storm_id, bounds, _frames, _times):
+    """
+    Build the MapLibre animation HTML for a storm.
+
+    The frames and times are fixed by the storm, so the HTML is cached on the
+    storm href, ID and bounds instead of hashing the frame arrays.
+
+    Parameters
+    ----------
+    aorc_storm_href: str
+        The icechunk s3 href of the storm.
+    storm_id: int
+        The ID of the storm.
+    bounds: list
+        The storm bounds as [[south, west], [north, east]].
+    _frames: np.ndarray
+        The precipitation frames (time, y, x).
+    _times: np.ndarray
+        The time values of the frames.
+
+    Returns
+    -------
+    str | None
+        The animation HTML, or None if the frames could not be rendered.
+    """
+    return build_storm_animation_maplibre(_frames, _times, bounds)
+
+
+@st.fragment
+def _storm_selection(rendered_storm_id):
+    """
+    Render the storm selection panel.
+
+    Changing the number of rows only reruns this panel. Selecting a different
+    storm changes every other panel, so it reruns the whole page.
+
+    Parameters
+    ----------
+    rendered_storm_id: int | None
+        The storm the rest of the page was last rendered for.
+    """
+    st.markdown("## Storm Selection")
+    st.info(
+        "Query storms from the catalog. Afterwards sort by rank, storm type, or date using the table headers."
+    )
+
+    st.session_state["num_storms"] = st.number_input(
+        "Select number of rows to return",
+        min_value=1,
+        max_value=450,
+        value=10,
+        step=10,
+    )
+    if st.session_state["num_storms"] is not None:
+        # Only fetch the table again when the pilot or row count changes
+        query_key = (
+            st.session_state["pilot_bucket"],
+            st.session_state.get("catalog_name", ""),
+            st.session_state["num_storms"],
+        )
+        if st.session_state.get("storms_query_key") != query_key:
+            st.session_state["storms_df_rank"] = query_iceberg_table(
+                table_name="storms",
+                target_bucket=query_key[0],
+                num_rows=query_key[2],
+                catalog_name=query_key[1],
+            )
+            st.session_state["storms_query_key"] = query_key
+        st.info(
+            "Select a single storm from the table below to view its metadata, map location, hyetographs, and animation."
+        )
+        if st.session_state["storm_log"] is not None:
+            st.warning(st.session_state["storm_log"])
+        if st.session_state["storms_df_rank"] is not None:
+            st.dataframe(
+                st.session_state["storms_df_rank"][_STORM_TABLE_COLUMNS],
+                width="stretch",
+                selection_mode="single-row",
+                on_select=_handle_storm_select,
+                key="storms_table_rank",
+            )
+        else:
+            st.warning("No storms found for this study.")
+    if st.session_state["hydromet_storm_id"] != rendered_storm_id:
+        st.rerun(scope="app")
+
+
+@st.fragment
+def _storm_animation():
+    """
+    Render the storm animation panel.
+
+    Generating the animation only reruns this panel instead of the whole page.
+    """
+    st.markdown("## Storm Animation")
+
+    if st.session_state["hydromet_storm_id"] is None:
+        st.info("Please select a storm.")
+    elif st.session_state["storm_log"] is not None:
+        st.warning(st.session_state["storm_log"])
+    else:
+        if st.button(
+            "Generate Animation",
+            type="primary",
+            use_container_width=True,
+        ):
+            st.session_state["storm_animation_requested"] = True
+            st.session_state["storm_animation_html"] = None
+            with st.spinner("Computing animation frames..."):
+                compute_storm_animation(
+                    storm_id=st.session_state["hydromet_storm_id"],
+                    storm_date=st.session_state["hydromet_storm_date"],
+                    aorc_storm_href=st.session_state["aorc_storm_href"],
+                )
+
+        animation_payload = st.session_state.get("storm_animation_payload")
+        if st.session_state.get("storm_animation_html"):
+            components_html(
+                st.session_state["storm_animation_html"],
+                height=500,
+                scrolling=False,
+            )
+        elif not st.session_state.get("storm_animation_requested"):
+            st.info(
+                "Click the button above to generate an animation for the selected storm."
+            )
+        elif animation_payload and animation_payload.get("frames") is not None:
+            if st.session_state.get("storm_bounds") is None:
+                st.warning(
+                    "Storm bounds not available yet. Try again after the map loads."
+                )
+            else:
+                if st.session_state.get("storm_animation_html") is None:
+                    with st.spinner("Rendering animation..."):
+                        start_time = time.time()
+                        st.session_state["storm_animation_html"] = (
+                            _build_storm_animation_html(
+                                st.session_state["aorc_storm_href"],
+                                st.session_state["hydromet_storm_id"],
+                                st.session_state.get("storm_bounds"),
+                                animation_payload.get("frames"),
+                                animation_payload.get("times"),
+                            )
+                        )
+                        end_time = time.time()
+                        elapsed_time = (end_time - start_time) / 60
+                        st.write(
+                            f"Animation rendering took {elapsed_time:.2f} minutes."
+                        )
+                if st.session_state["storm_animation_html"]:
+                    components_html(
+                        st.session_state["storm_animation_html"],
+                        height=650,
+                        scrolling=False,
+                    )
+                else:
+                    st.warning("Unable to render animation for this storm.")
+        else:
+            st.warning("Animation frames are not ready. Try again.")
+
+
+@st.fragment
+def _hyeto_panel(drawings):
+    """
+    Compute hyetographs for new map points and render the plots and tables.
+
+    New points are computed before the plots in the same pass, so they show up
+    without a rerun, and the Show Tables toggle reruns only this panel.
+
+    Parameters
+    ----------
+    drawings: list | None
+        The map drawings to compute hyetographs for, if a storm is selected.
+    """
+    if drawings:
+        storm_id = st.session_state["hydromet_storm_id"]
+        storm_date = st.session_state["hydromet_storm_date"]
+        aorc_storm_href = st.session_state["aorc_storm_href"]
+        hyeto_cache = st.session_state["hyeto_cache"]
+        for drawing in drawings:
+            geometry = drawing.get("geometry", {})
+            if geometry.get("type") != "Point":
+                continue
+            coordinates = geometry.get("coordinates", [])
+            if len(coordinates) != 2:
+                continue
+            lon, lat = coordinates
+            cache_key = (lat, lon, storm_id)
+            if cache_key in hyeto_cache:
+                continue
+            compute_hyetograph(
+                storm_id=storm_id,
+                storm_date=storm_date,
+                aorc_storm_href=aorc_storm_href,
+                lat=lat,
+                lon=lon,
+            )
+    with st.expander("Plots", expanded=True, icon="📈"):
+        if st.session_state.get("hyeto_df_cache"):
+            storm_id = st.session_state["hydromet_storm_id"]
+            points = tuple(st.session_state["hyeto_index"].get(storm_id, ()))
+            fig = _build_hyeto_fig(st.session_state["aorc_storm_href"], points)
+            st.plotly_chart(fig, width="stretch")
+    if st.toggle("🔢 Show Tables", key="hyeto_tables_open"):
+        with st.expander("Tables", expanded=True, icon="🔢"):
+            if st.session_state.get("hyeto_df_cache"):
+                storm_id = st.session_state["hydromet_storm_id"]
+                for key in st.session_state["hyeto_index"].get(storm_id, ()):
+                    lat, lon, _ = key
+                    hyeto_df_display = st.session_state["hyeto_df_cache"][key][2]
+
+                    st.markdown(f"### Lat {lat:.4f}, Lon {lon:.4f}")
+                    st.dataframe(hyeto_df_display, width="stretch")
 
 
 def met():
     st.set_page_config(page_title="stormlit", page_icon=":rain_cloud:", layout="wide")
     if "session_id" not in st.session_state:
         init_session_state()
+    # Fill in any page keys missing from sessions started before they existed
+    for key, default in (
+        ("hyeto_cache", {}),
+        ("hyeto_df_cache", {}),
+        ("hyeto_index", {}),
+        ("hyeto_fig", None),
+        ("storm_animation_requested", False),
+        ("storm_animation_html", None),
+    ):
+        st.session_state.setdefault(key, default)
     st.title("Meteorology")
     # Sidebar configuration
     st.sidebar.markdown("# Page Navigation")
@@ -116,7 +398,11 @@ def met():
         st.session_state["hydromet_storm_date"] = None
         st.session_state["aorc_storm_href"] = None
         st.session_state["storms_df_rank"] = None
+        st.session_state["storms_query_key"] = None
         st.session_state["hyeto_cache"] = {}
+        st.session_state["hyeto_df_cache"] = {}
+        st.session_state["hyeto_index"] = {}
+        st.session_state["hyeto_fig"] = None
         st.session_state["storm_cache"] = None
         st.session_state["storm_bounds"] = None
         st.session_state["clipped_storm_bounds"] = None
@@ -132,8 +418,6 @@ def met():
         with st.spinner("Initializing Meteorology datasets..."):
             init_met_pilot(pilot_name, config_path)
 
-    st.session_state.setdefault("hyeto_cache", {})
-
     map_col, info_col = st.columns(2)
     map_tab, session_tab = map_col.tabs(["Map", "Session State"])
     selections_tab, metadata_tab, hyeto_tab, anime_tab = info_col.tabs(
@@ -141,40 +425,7 @@ def met():
     )
     # Selection Panel
     with selections_tab:
-        st.markdown("## Storm Selection")
-        st.info(
-            "Query storms from the catalog. Afterwards sort by rank, storm type, or date using the table headers."
-        )
-
-        st.session_state["num_storms"] = st.number_input(
-            "Select number of rows to return",
-            min_value=1,
-            max_value=450,
-            value=10,
-            step=10,
-        )
-        if st.session_state["num_storms"] is not None:
-            st.session_state["storms_df_rank"] = query_iceberg_table(
-                table_name="storms",
-                target_bucket=st.session_state["pilot_bucket"],
-                num_rows=st.session_state["num_storms"],
-                catalog_name=st.session_state.get("catalog_name", ""),
-            )
-            st.info(
-                "Select a single storm from the table below to view its metadata, map location, hyetographs, and animation."
-            )
-            if st.session_state["storm_log"] is not None:
-                st.warning(st.session_state["storm_log"])
-            if st.session_state["storms_df_rank"] is not None:
-                st.dataframe(
-                    st.session_state["storms_df_rank"],
-                    width="stretch",
-                    selection_mode="single-row",
-                    on_select=_handle_storm_select,
-                    key="storms_table_rank",
-                )
-            else:
-                st.warning("No storms found for this study.")
+        _storm_selection(st.session_state["hydromet_storm_id"])
 
     # Compute storm data if a storm is selected
     if st.session_state["hydromet_storm_id"] is not None:
@@ -235,6 +486,9 @@ def met():
     # Hyetograph Panel
     with hyeto_tab:
         st.markdown("## Storm Hyetographs")
+        # The map's Hyetograph Locations layer picks up new points on the next
+        # full run, the user's marker already shows them in the meantime
+        drawings = None
         if st.session_state["hydromet_storm_id"] is None:
             st.info("Please select a storm.")
         elif st.map_output.get("all_drawings") is None:
@@ -242,153 +496,11 @@ def met():
                 "Drop one or multiple points as markers on the map to view hyetographs."
             )
         else:
-            storm_id = st.session_state["hydromet_storm_id"]
-            storm_date = st.session_state["hydromet_storm_date"]
-            aorc_storm_href = st.session_state["aorc_storm_href"]
-            hyeto_cache = st.session_state.setdefault("hyeto_cache", {})
-            added_points = False
-            for drawing in st.map_output["all_drawings"]:
-                geometry = drawing.get("geometry", {})
-                if geometry.get("type") != "Point":
-                    continue
-                coordinates = geometry.get("coordinates", [])
-                if len(coordinates) != 2:
-                    continue
-                lon, lat = coordinates
-                cache_key = (lat, lon, storm_id)
-                if cache_key in hyeto_cache:
-                    continue
-                compute_hyetograph(
-                    storm_id=storm_id,
-                    storm_date=storm_date,
-                    aorc_storm_href=aorc_storm_href,
-                    lat=lat,
-                    lon=lon,
-                    tab=hyeto_tab,
-                )
-                added_points = True
-            if added_points:
-                st.rerun()
-        with st.expander("Plots", expanded=True, icon="📈"):
-            if st.session_state.get("hyeto_cache"):
-                fig = go.Figure()
-                for key, hyeto_da in st.session_state["hyeto_cache"].items():
-                    lat, lon, storm_id = key
-                    if storm_id != st.session_state["hydromet_storm_id"]:
-                        continue
-                    hyeto_df = hyeto_da.to_dataframe(name="precip_in").reset_index()
-                    time_cols = [
-                        col for col in ("abs_time", "time") if col in hyeto_df.columns
-                    ]
-                    if time_cols:
-                        x_col = time_cols[0]
-                    else:
-                        hyeto_df["timestep"] = range(len(hyeto_df))
-                        x_col = "timestep"
-
-                    fig.add_trace(
-                        go.Scatter(
-                            x=hyeto_df[x_col],
-                            y=hyeto_df["precip_in"],
-                            mode="lines+markers",
-                            name=f"Lat {lat:.4f}, Lon {lon:.4f}",
-                        )
-                    )
-
-                fig.update_layout(
-                    title="Hyetographs",
-                    xaxis_title="Time",
-                    yaxis_title="Precipitation (inches)",
-                    margin=dict(l=20, r=20, t=40, b=20),
-                    legend_title_text="Locations",
-                )
-                st.plotly_chart(fig, width="stretch")
-        with st.expander("Tables", expanded=False, icon="🔢"):
-            if st.session_state.get("hyeto_cache"):
-                for key, hyeto_da in st.session_state["hyeto_cache"].items():
-                    lat, lon, storm_id = key
-                    if storm_id != st.session_state["hydromet_storm_id"]:
-                        continue
-                    hyeto_df = hyeto_da.to_dataframe(name="precip_in").reset_index()
-                    hyeto_df_display = hyeto_df.copy()
-                    time_cols = [
-                        col for col in ("abs_time", "time") if col in hyeto_df.columns
-                    ]
-                    if time_cols:
-                        x_col = time_cols[0]
-                        hyeto_df_display[x_col] = hyeto_df_display[x_col].astype(str)
-                    else:
-                        hyeto_df_display["timestep"] = range(len(hyeto_df_display))
-
-                    st.markdown(f"### Lat {lat:.4f}, Lon {lon:.4f}")
-                    st.dataframe(hyeto_df_display, width="stretch")
+            drawings = st.map_output["all_drawings"]
+        _hyeto_panel(drawings)
     # Animation Panel
     with anime_tab:
-        st.markdown("## Storm Animation")
-        st.session_state.setdefault("storm_animation_requested", False)
-        st.session_state.setdefault("storm_animation_html", None)
-
-        if st.session_state["hydromet_storm_id"] is None:
-            st.info("Please select a storm.")
-        elif st.session_state["storm_log"] is not None:
-            st.warning(st.session_state["storm_log"])
-        else:
-            if st.button(
-                "Generate Animation",
-                type="primary",
-                use_container_width=True,
-            ):
-                st.session_state["storm_animation_requested"] = True
-                st.session_state["storm_animation_html"] = None
-                with st.spinner("Computing animation frames..."):
-                    compute_storm_animation(
-                        storm_id=st.session_state["hydromet_storm_id"],
-                        storm_date=st.session_state["hydromet_storm_date"],
-                        aorc_storm_href=st.session_state["aorc_storm_href"],
-                    )
-
-            animation_payload = st.session_state.get("storm_animation_payload")
-            if st.session_state.get("storm_animation_html"):
-                components_html(
-                    st.session_state["storm_animation_html"],
-                    height=500,
-                    scrolling=False,
-                )
-            elif not st.session_state.get("storm_animation_requested"):
-                st.info(
-                    "Click the button above to generate an animation for the selected storm."
-                )
-            elif animation_payload and animation_payload.get("frames") is not None:
-                if st.session_state.get("storm_bounds") is None:
-                    st.warning(
-                        "Storm bounds not available yet. Try again after the map loads."
-                    )
-                else:
-                    if st.session_state.get("storm_animation_html") is None:
-                        with st.spinner("Rendering animation..."):
-                            start_time = time.time()
-                            st.session_state["storm_animation_html"] = (
-                                build_storm_animation_maplibre(
-                                    animation_payload.get("frames"),
-                                    animation_payload.get("times"),
-                                    st.session_state.get("storm_bounds"),
-                                )
-                            )
-                            end_time = time.time()
-                            elapsed_time = (end_time - start_time) / 60
-                            st.write(
-                                f"Animation rendering took {elapsed_time:.2f} minutes."
-                            )
-                    if st.session_state["storm_animation_html"]:
-                        components_html(
-                            st.session_state["storm_animation_html"],
-                            height=650,
-                            scrolling=False,
-                        )
-                    else:
-                        st.warning("Unable to render animation for this storm.")
-            else:
-                st.warning("Animation frames are not ready. Try again.")
+        _storm_animation()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 # module imports
-from utils.session import init_session_state
+from utils.session import init_session_state, summarize_session_state
 from utils.metrics import calc_metrics, eval_metrics, define_metrics
 from utils.nwis_api import query_nwis, select_usgs_gages
 from db.utils import create_pg_connection, create_s3_connection
@@ -19,6 +19,7 @@ from utils.mapping import (
     get_gis_legend_stats,
     get_model_subbasin,
     get_gage_from_ref_ln,
+    geojson_to_shape,
 )
 from utils.stac_data import (
     reset_selections,
@@ -49,7 +50,6 @@ import streamlit as st
 import pandas as pd
 from dotenv import load_dotenv
 from urllib.parse import urljoin
-from shapely.geometry import shape
 
 currDir = os.path.dirname(os.path.realpath(__file__))  # located within pages folder
 srcDir = os.path.abspath(os.path.join(currDir, ".."))  # go up one level to src
@@ -483,7 +483,7 @@ def ras_results():
         layer = properties.get("layer")
         geom = last_active_drawing.get("geometry", None)
         if geom and isinstance(geom, dict):
-            geom = shape(geom)
+            geom = geojson_to_shape(geom)
         if layer:
             feature_type = FeatureType(layer)
             if feature_type in (
@@ -651,12 +651,24 @@ def ras_results():
             num_ref_lines = len(st.session_state["ref_lines_filtered"])
             num_models = 1
             num_bc_lines = len(st.session_state["bc_lines_filtered"])
+            # Look up the selected model geometry once for gages and dams
+            model_geom = None
+            if st.session_state["model_id"] in st.models_by_id.index:
+                model_geoms = st.models_by_id.geometry.loc[
+                    [st.session_state["model_id"]]
+                ]
+                model_geom = (
+                    model_geoms.iloc[0]
+                    if len(model_geoms) == 1
+                    else model_geoms.union_all()
+                )
             num_gages = get_gis_legend_stats(
                 st.gages,
                 "gages_filtered",
                 st.models,
                 "model",
                 st.session_state["model_id"],
+                area_geom=model_geom,
             )
             num_dams = get_gis_legend_stats(
                 st.dams,
@@ -664,64 +676,52 @@ def ras_results():
                 st.models,
                 "model",
                 st.session_state["model_id"],
+                area_geom=model_geom,
             )
 
     # Dropdowns for each feature type
     with col_bc_lines:
         map_popover(
             "🟥BC Lines",
-            {}
-            if st.session_state["bc_lines_filtered"] is None
-            else st.session_state["bc_lines_filtered"].to_dict("records"),
-            lambda bc_line: bc_line["id"],
-            get_item_id=lambda bc_line: bc_line["id"],
+            st.session_state["bc_lines_filtered"],
             feature_type=FeatureType.BC_LINE,
+            key_column="id",
             image_path=os.path.join(assetsDir, "bc_line_icon.jpg"),
             logger=logger,
         )
     with col_ref_points:
         map_popover(
             "🟧 Reference Points",
-            {}
-            if st.session_state["ref_points_filtered"] is None
-            else st.session_state["ref_points_filtered"].to_dict("records"),
-            lambda ref_point: ref_point["id"],
-            get_item_id=lambda ref_point: ref_point["id"],
+            st.session_state["ref_points_filtered"],
             feature_type=FeatureType.REFERENCE_POINT,
+            key_column="id",
             image_path=os.path.join(assetsDir, "ref_point_icon.png"),
             logger=logger,
         )
     with col_ref_lines:
         map_popover(
             "🟫 Reference Lines",
-            {}
-            if st.session_state["ref_lines_filtered"] is None
-            else st.session_state["ref_lines_filtered"].to_dict("records"),
-            lambda ref_line: ref_line["id"],
-            get_item_id=lambda ref_line: ref_line["id"],
+            st.session_state["ref_lines_filtered"],
             feature_type=FeatureType.REFERENCE_LINE,
+            key_column="id",
             image_path=os.path.join(assetsDir, "ref_line_icon.png"),
             logger=logger,
         )
     with col_models:
         map_popover(
             "🟦 Models",
-            st.models.to_dict("records"),
-            lambda model: f"{model['model']}",
-            get_item_id=lambda model: model["model"],
+            st.models,
             feature_type=FeatureType.MODEL,
+            key_column="model",
             image_path=os.path.join(assetsDir, "model_icon.jpg"),
             logger=logger,
         )
     with col_gages:
         map_popover(
             "🟩 Gages",
-            {}
-            if st.session_state["gages_filtered"] is None
-            else st.session_state["gages_filtered"].to_dict("records"),
-            lambda gage: gage["site_no"],
-            get_item_id=lambda gage: gage["site_no"],
+            st.session_state["gages_filtered"],
             feature_type=FeatureType.GAGE,
+            key_column="site_no",
             download_url=st.pilot_layers["Gages"],
             image_path=os.path.join(assetsDir, "gage_icon.png"),
             logger=logger,
@@ -729,12 +729,9 @@ def ras_results():
     with col_dams:
         map_popover(
             "🟥 Dams",
-            {}
-            if st.session_state["dams_filtered"] is None
-            else st.session_state["dams_filtered"].to_dict("records"),
-            lambda dam: dam["id"],
-            get_item_id=lambda dam: dam["id"],
+            st.session_state["dams_filtered"],
             feature_type=FeatureType.DAM,
+            key_column="id",
             download_url=st.pilot_layers["Dams"],
             image_path=os.path.join(assetsDir, "dam_icon.jpg"),
             logger=logger,
@@ -790,7 +787,7 @@ def ras_results():
 
     if os.getenv("SHOW_SESSION_STATE") == "True":
         with st.expander("Session State", expanded=False):
-            st.json(st.session_state)
+            st.json(summarize_session_state())
 
 
 if __name__ == "__main__":
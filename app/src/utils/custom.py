@@ -1,18 +1,20 @@
 # standard imports
 import re
+import functools
 import streamlit as st
 import logging
+import pandas as pd
 from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
 
-# third party imports
-from streamlit.errors import StreamlitDuplicateElementKey
-
 # module imports
 from utils.mapping import focus_feature
 
 if TYPE_CHECKING:
     from streamlit.delta_generator import DeltaGenerator
 
+# Columns read by focus_feature when a popover button is clicked
+_FOCUS_COLUMNS = ("geometry", "lat", "lon", "model", "hms_element")
+
 
 def stylable_container(key: str, css_styles: str | list[str]) -> "DeltaGenerator":
     """
@@ -54,17 +56,44 @@ def stylable_container(key: str, css_styles: str | list[str]) -> "DeltaGenerator
     return container
 
 
+@functools.lru_cache(maxsize=8)
+def _popover_css(color: str) -> str:
+    """
+    Build the CSS for a popover button of the given color once and reuse it.
+    """
+    return f"""
+            button {{
+                background-color: {color};
+                color: black;
+                border-radius: 5px;
+                white-space: nowrap;
+            }}
+        """
+
+
+def _focus_row(
+    rows: pd.DataFrame, position: int, item_id, item_label: str, feature_type
+):
+    """
+    Focus the feature in one row of a popover DataFrame.
+
+    The row is only converted to a dict when its button is clicked.
+    """
+    focus_feature(rows.iloc[position].to_dict(), item_id, item_label, feature_type)
+
+
 def map_popover(
     label: str,
-    items: Sequence[Any],
-    get_item_label: Callable,
-    get_item_id: Callable,
+    items: Sequence[Any] | pd.DataFrame | None,
+    get_item_label: Optional[Callable] = None,
+    get_item_id: Optional[Callable] = None,
     color: str = "#f0f0f0",
     callback: Optional[Callable] = None,
     feature_type: Optional = None,
     download_url: Optional[str] = None,
     image_path: Optional[str] = None,
     logger: Optional[logging.Logger] = None,
+    key_column: Optional[str] = None,
 ):
     """
     Create a popover with buttons for each item in the button_data list.
@@ -75,37 +104,67 @@ def map_popover(
     ----------
     label: str
         The label for the popover
-    items: Sequence
-        An iterable containing the button data
-    get_item_label: Callable
-        A function that takes an item and returns the label for the button
-    get_item_id: Callable
-        A function that takes an item and returns the ID for the button
+    items: Sequence | pd.DataFrame | None
+        An iterable containing the button data, or a DataFrame with one row per
+        button. DataFrame rows are read column-wise and only the clicked row is
+        converted to a dict
+    get_item_label: Optional[Callable]
+        A function that takes an item and returns the label for the button.
+        Not used for DataFrame items, which are labelled by key_column
+    get_item_id: Optional[Callable]
+        A function that takes an item and returns the ID for the button.
+        Not used for DataFrame items, which are identified by key_column
     callback: Optional[Callable]
         A function to be called when the button is clicked. Receives the raw item as
-        its only positional argument.
+        its only positional argument. Not supported for DataFrame items
     feature_type: Optional[FeatureType]
         The type of feature (Basin, Gage, Dam, Reference Line, Reference Point)
     download_url: Optional[str]
         A URL to download data related to the items
     image_path: Optional[str]
         A path to an image to display in the popover
+    key_column: Optional[str]
+        The DataFrame column holding the item ID and label
     Returns
     -------
     None
 
     """
+    if items is None:
+        items = []
+    # Collect (item_id, item_label, on_click, args) for each unique item
+    buttons = []
+    if isinstance(items, pd.DataFrame):
+        keep_cols = [
+            col for col in items.columns if col in _FOCUS_COLUMNS or col == key_column
+        ]
+        rows = items[keep_cols].drop_duplicates(key_column)
+        for position, item_id in enumerate(rows[key_column].tolist()):
+            item_label = str(item_id)
+            buttons.append(
+                (
+                    item_id,
+                    item_label,
+                    _focus_row,
+                    (rows, position, item_id, item_label, feature_type),
+                )
+            )
+    else:
+        seen_ids = set()
+        on_click_fn = callback or focus_feature
+        for item in items:
+            item_id = get_item_id(item)
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+            item_label = str(get_item_label(item))
+            on_click_args = (
+                (item,) if callback else (item, item_id, item_label, feature_type)
+            )
+            buttons.append((item_id, item_label, on_click_fn, on_click_args))
     with stylable_container(
         key=f"popover_container_{label}",
-        css_styles=f"""
-            button {{
-                background-color: {color};
-                color: black;
-                color: black;
-                border-radius: 5px;
-                white-space: nowrap;
-            }}
-        """,
+        css_styles=_popover_css(color),
     ):
         with st.popover(label, width="stretch"):
             if image_path:
@@ -117,37 +176,21 @@ def map_popover(
                 st.write(
                     "Select a feature from the map or model from the dropdown to generate selections"
                 )
-            for idx, item in enumerate(items):
-                item_label = str(get_item_label(item))
-                item_id = get_item_id(item)
-                current_feature_id = st.session_state.get(
-                    "single_event_focus_feature_id"
+            # Duplicate IDs are dropped above so every button key is unique
+            if len(buttons) < len(items):
+                (logger or logging.getLogger(__name__)).debug(
+                    f"Dropped {len(items) - len(buttons)} duplicate items from {label}."
                 )
+            current_feature_id = st.session_state.get("single_event_focus_feature_id")
+            for item_id, item_label, on_click_fn, on_click_args in buttons:
                 if item_id == current_feature_id and item_id is not None:
                     item_label += " ✅"
-                button_key = f"btn_{label}_{item_id}_{idx}"
-                on_click_fn = callback or focus_feature
-                on_click_args = (
-                    (item,) if callback else (item, item_id, item_label, feature_type)
+                st.button(
+                    label=item_label,
+                    key=f"btn_{label}_{item_id}",
+                    on_click=on_click_fn,
+                    args=on_click_args,
                 )
-                try:
-                    st.button(
-                        label=item_label,
-                        key=button_key,
-                        on_click=on_click_fn,
-                        args=on_click_args,
-                    )
-                except StreamlitDuplicateElementKey as e:
-                    logger.warning(
-                        f"Duplicate button key detected ({button_key}): {e}.",
-                    )
-                    st.button(
-                        label=item_label,
-                        key=f"{button_key}_DUPE",
-                        on_click=on_click_fn,
-                        args=on_click_args,
-                        disabled=True,
-                    )
     st.map_output = None
 
 
@@ -157,14 +200,7 @@ def about_popover(color: str = "white"):
     """
     with stylable_container(
         key="popover_container_about",
-        css_styles=f"""
-            button {{
-                background-color: {color};
-                color: black;
-                border-radius: 5px;
-                white-space: nowrap;
-            }}
-        """,
+        css_styles=_popover_css(color),
     ):
         with st.popover("READ ME ℹ️", width="stretch"):
             st.markdown(
@@ -189,14 +225,7 @@ def about_popover_met(color: str = "white"):
     """
     with stylable_container(
         key="popover_container_about",
-        css_styles=f"""
-            button {{
-                background-color: {color};
-                color: black;
-                border-radius: 5px;
-                white-space: nowrap;
-            }}
-        """,
+        css_styles=_popover_css(color),
     ):
         with st.popover("READ ME ℹ️", width="stretch"):
             st.markdown(
@@ -1,11 +1,13 @@
 import logging
 import folium
+from folium.utilities import image_to_url
 import pandas as pd
 import streamlit as st
 import leafmap.foliumap as leafmap
 import geopandas as gpd
-from shapely.affinity import affine_transform
-from shapely.geometry import shape
+import shapely
+from shapely.geometry import LineString, Point, Polygon, shape
+from shapely.geometry.base import BaseGeometry
 import xarray as xr
 import numpy as np
 import matplotlib.cm as cm
@@ -213,23 +215,28 @@ def add_storm_layer(m: leafmap.Map, storm_id: int | None) -> None:
     if storm_id is None or storm_data is None:
         return
     bounds = st.session_state.get("clipped_storm_bounds")
-    st.session_state["storm_max"] = float(storm_data.max().item())
-    st.session_state["storm_min"] = float(storm_data.min().item())
     if bounds is None:
         bounds = _compute_overlay_bounds(storm_data)
         if bounds is None:
             return
         st.session_state["clipped_storm_bounds"] = bounds
 
-    storm_overlay = _downsample_for_overlay(storm_data)
-    rgba_image = _prepare_rgba_image(
-        storm_overlay.values.astype(np.float32, copy=False)
-    )
-    if rgba_image is None:
+    # The overlay only changes when compute_storm stores a new storm DataArray
+    cached_data, image_url = st.session_state.get("storm_overlay") or (None, None)
+    if cached_data is not storm_data:
+        st.session_state["storm_max"] = float(storm_data.max().item())
+        st.session_state["storm_min"] = float(storm_data.min().item())
+        storm_overlay = _downsample_for_overlay(storm_data)
+        rgba_image = _prepare_rgba_image(
+            storm_overlay.values.astype(np.float32, copy=False)
+        )
+        image_url = None if rgba_image is None else image_to_url(rgba_image)
+        st.session_state["storm_overlay"] = (storm_data, image_url)
+    if image_url is None:
         return
 
     folium.raster_layers.ImageOverlay(
-        image=rgba_image,
+        image=image_url,
         bounds=bounds,
         opacity=0.75,
         name=f"Storm {storm_id}",
@@ -239,6 +246,17 @@ def add_storm_layer(m: leafmap.Map, storm_id: int | None) -> None:
     ).add_to(m)
 
 
+def _mean_centroid(gdf: gpd.GeoDataFrame) -> tuple[float, float]:
+    """
+    Get the mean centroid latitude and longitude of a GeoDataFrame, using the
+    lat/lon columns computed by prep_gdf when available.
+    """
+    if "lat" in gdf.columns and "lon" in gdf.columns:
+        return gdf["lat"].mean(), gdf["lon"].mean()
+    centroids = gdf.geometry.centroid
+    return centroids.y.mean(), centroids.x.mean()
+
+
 def get_map_pos(map_layer: str):
     """
     Get the map position based on the selected layer and field.
@@ -262,18 +280,10 @@ def get_map_pos(map_layer: str):
 
     # Otherwise, use default position based on layer
     if map_layer == "HMS":
-        c_df = st.subbasins.copy()
-        if "lat" not in c_df.columns or "lon" not in c_df.columns:
-            c_df["lat"] = c_df.geometry.centroid.y
-            c_df["lon"] = c_df.geometry.centroid.x
-        c_lat, c_lon = c_df["lat"].mean(), c_df["lon"].mean()
+        c_lat, c_lon = _mean_centroid(st.subbasins)
         c_zoom = 8
     elif map_layer == "RAS":
-        c_df = st.models.copy()
-        if "lat" not in c_df.columns or "lon" not in c_df.columns:
-            c_df["lat"] = c_df.geometry.centroid.y
-            c_df["lon"] = c_df.geometry.centroid.x
-        c_lat, c_lon = c_df["lat"].mean(), c_df["lon"].mean()
+        c_lat, c_lon = _mean_centroid(st.models)
         c_zoom = 8
     elif map_layer == "MET":
         c_df = st.transpo.copy()
@@ -399,9 +409,7 @@ def prep_metmap(
                 )
             if transform_params is not None:
                 st.transposed_study_area.geometry = (
-                    st.transposed_study_area.geometry.apply(
-                        lambda geom: affine_transform(geom, transform_params)
-                    )
+                    st.transposed_study_area.geometry.affine_transform(transform_params)
                 )
                 m.add_gdf(
                     st.transposed_study_area,
@@ -435,18 +443,12 @@ def prep_metmap(
             )
     if st.session_state["hyeto_cache"] is not None:
         if storm_id is not None:
-            keys = st.session_state["hyeto_cache"].keys()
-            points = [
-                (lon, lat)
-                for (lat, lon, key_storm_id) in keys
-                if key_storm_id == storm_id
-            ]
+            keys = st.session_state.get("hyeto_index", {}).get(storm_id, ())
+            points = [(lon, lat) for (lat, lon, _) in keys]
             if points:
+                lons, lats = zip(*points)
                 hyeto_gdf = gpd.GeoDataFrame(
-                    geometry=[
-                        shape({"type": "Point", "coordinates": coords})
-                        for coords in points
-                    ],
+                    geometry=gpd.points_from_xy(lons, lats),
                     crs="EPSG:4326",
                 )
                 hyeto_gdf["lat"] = hyeto_gdf.geometry.y.round(4)
@@ -787,7 +789,9 @@ def prep_hmsmap(bounds: list, zoom: int, c_lat: float, c_lon: float) -> leafmap.
 
 
 def get_hms_legend_stats(
-    selected_gdf: gpd.GeoDataFrame, session_gdf: gpd.GeoDataFrame, filtered_gdf: str
+    model_geom: BaseGeometry | None,
+    session_gdf: gpd.GeoDataFrame,
+    filtered_gdf: str,
 ):
     """
     Generate HMS model subbasin statistics for the map legend based on given geodataframe.
@@ -795,8 +799,8 @@ def get_hms_legend_stats(
 
     Parameters
     ----------
-    selected_gdf: gpd.GeoDataFrame
-        The GeoDataFrame containing the selected geometry.
+    model_geom: BaseGeometry | None
+        The geometry of the selected subbasin, or None if no subbasin is selected.
     session_gdf: gpd.GeoDataFrame
         The GeoDataFrame containing geometries to filter subbasins.
     filtered_gdf: str
@@ -807,10 +811,15 @@ def get_hms_legend_stats(
     num_subbasins: int
         The number of subbasins filtered and stored in session state.
     """
-    if not selected_gdf.empty:
-        model_geom = selected_gdf.geometry.iloc[0]
-        centroids = session_gdf.geometry.centroid
-        mask = centroids.within(model_geom)
+    if model_geom is not None:
+        # Test the centroid coordinates that prep_gdf already stored in the
+        # lat/lon columns against the prepared model geometry
+        shapely.prepare(model_geom)
+        mask = shapely.contains_xy(
+            model_geom,
+            session_gdf["lon"].to_numpy(),
+            session_gdf["lat"].to_numpy(),
+        )
         st.session_state[filtered_gdf] = session_gdf[mask].copy()
         st.session_state[filtered_gdf]["model"] = st.session_state["subbasin_id"]
         num_items = len(st.session_state[filtered_gdf])
@@ -826,6 +835,7 @@ def get_gis_legend_stats(
     area_gdf: gpd.GeoDataFrame,
     area_col: str,
     target_id: str,
+    area_geom: BaseGeometry | None = None,
 ):
     """
     Generate GIS layer (gages and dams) statistics for the map legend based on given geodataframe.
@@ -848,51 +858,43 @@ def get_gis_legend_stats(
     target_id: str
         The target area ID to filter by.
         Example: st.session_state["subbasin_id"] for HMS subbasins, st.session_state["model_id"] for RAS models.
+    area_geom: BaseGeometry | None
+        The already resolved geometry of the target area. If None, it is looked up
+        from area_gdf so that callers filtering several layers can share one lookup.
 
     Returns
     -------
     num_items: int
         The number of items filtered and stored in session state.
     """
-    st.session_state[filtered_gdf] = gpd.sjoin(
-        session_gdf,
-        area_gdf[area_gdf[area_col] == target_id],
-        how="inner",
-        predicate="intersects",
-    )
-    st.session_state[filtered_gdf]["lat"] = st.session_state[filtered_gdf]["lat_left"]
-    st.session_state[filtered_gdf]["lon"] = st.session_state[filtered_gdf]["lon_left"]
-    st.session_state[filtered_gdf]["index"] = st.session_state[filtered_gdf][
-        "index_right"
-    ]
-    st.session_state[filtered_gdf]["layer"] = "Gages"
-    st.session_state[filtered_gdf].drop(
-        columns=[
-            "lat_left",
-            "lon_left",
-            "lat_right",
-            "lon_right",
-            "layer_right",
-            "layer_left",
-            "index_right",
-        ],
-        inplace=True,
-    )
+    if area_geom is None:
+        area_geoms = area_gdf.geometry[area_gdf[area_col] == target_id]
+        if len(area_geoms) == 1:
+            area_geom = area_geoms.iloc[0]
+        elif len(area_geoms) > 1:
+            area_geom = area_geoms.union_all()
+    if area_geom is None:
+        filtered = session_gdf.iloc[0:0].copy()
+    else:
+        # A single area polygon does not need a spatial join
+        filtered = session_gdf[session_gdf.geometry.intersects(area_geom)].copy()
+    filtered[area_col] = target_id
+    st.session_state[filtered_gdf] = filtered
     num_items = len(st.session_state[filtered_gdf])
     return num_items
 
 
 def get_model_subbasin(
-    geom: gpd.GeoSeries, session_gdf: gpd.GeoDataFrame, element_col: str
+    geom: BaseGeometry, session_gdf: gpd.GeoDataFrame, element_col: str
 ):
     """
-    Get the HMS or RAS model subbasin ID that a provided geodataframe's geometry may be within.
+    Get the HMS or RAS model subbasin ID that a provided geometry may be within.
     A subbasin refers to either an HMS or RAS model subbasin.
 
     Parameters
     ----------
-    geom: gpd.GeoSeries
-        The GeoSeries containing subbasin data.
+    geom: BaseGeometry
+        The geometry of the selected feature.
     session_gdf: gpd.GeoDataFrame
         The GeoDataFrame containing subbasin geometries.
         Example: st.subbasins for HMS subbasins, st.models for RAS models.
@@ -904,72 +906,109 @@ def get_model_subbasin(
     subbasin_id: str
         The subbasin ID extracted from the GeoDataFrame.
     """
-    # Get the centroids of the geometries in the GeoDataFrame
+    if geom is None:
+        return None
     centroid = geom.centroid
-    # Check if the centroid is within any subbasin geometry
-    mask = centroid.within(session_gdf.geometry)
-    filtered_gdf = session_gdf[mask].copy()
-    if not filtered_gdf.empty:
-        subbasin_id = filtered_gdf.iloc[0][element_col]
+    # Prune to the subbasins whose bounding boxes hold the centroid, then run a
+    # vectorized point-in-polygon test on the remaining candidates
+    candidates = session_gdf.sindex.query(centroid)
+    mask = shapely.contains_xy(
+        session_gdf.geometry.values[candidates], centroid.x, centroid.y
+    )
+    matches = candidates[mask]
+    if len(matches) > 0:
+        subbasin_id = session_gdf.iloc[matches.min()][element_col]
         return subbasin_id
 
 
-def get_gage_from_subbasin(subbasin_geom: gpd.GeoSeries):
+def geojson_to_shape(geom: dict) -> BaseGeometry:
     """
-    Get the gage ID from a subbasin geometry.
-    Determine if there are any gage points located within the subbasin polygon
+    Convert a GeoJSON geometry dict into a shapely geometry.
+
+    Points, lines and polygons, the geometries returned by map clicks, are
+    built straight from their coordinates. Other types go through shape.
 
     Parameters
     ----------
-    subbasin_geom: gpd.GeoSeries
-        A GeoSeries containing the geometry of the subbasin.
+    geom: dict
+        A GeoJSON geometry with "type" and "coordinates" keys.
 
     Returns
     -------
-    gage_id: str
-        The gage ID if a gage is found within the subbasin, otherwise None
+    BaseGeometry
+        The shapely geometry.
     """
-    # Combine all subbasin geometries into one (if multiple)
-    subbasin_geom = subbasin_geom.union_all()
-    if subbasin_geom is None or subbasin_geom.is_empty:
-        return None
-    # Get centroids of all gages
-    gage_centroids = st.gages.centroid
-    # Find which gage centroids are within the subbasin geometry
-    mask = gage_centroids.within(subbasin_geom)
-    filtered_gdf = st.gages[mask].copy()
-    if not filtered_gdf.empty:
-        return filtered_gdf["site_no"].tolist()
-    else:
-        return None
-
-
-def get_gage_from_pt_ln(_geom: gpd.GeoSeries):
+    geom_type = geom.get("type")
+    coords = geom.get("coordinates")
+    if geom_type == "Point":
+        return Point(coords)
+    if geom_type == "LineString":
+        return LineString(coords)
+    if geom_type == "Polygon" and coords:
+        return Polygon(coords[0], coords[1:])
+    return shape(geom)
+
+
+def build_gages_by_element(
+    gages: gpd.GeoDataFrame,
+    subbasins: gpd.GeoDataFrame,
+    pt_ln_layers: list[gpd.GeoDataFrame],
+) -> dict:
     """
-    Get the gage ID from a point or line geometry.
-    Determine if there are any gage points located within the reach line.
+    Map every HMS element to the gages associated with it.
+
+    Subbasins get the gages whose centroid lies within them. Reaches, junctions
+    and reservoirs get the gages of the subbasins containing their centroid.
 
     Parameters
     ----------
-    _geom: gpd.GeoSeries
-        A GeoSeries containing the geometry of the point or line.
+    gages: gpd.GeoDataFrame
+        The gages prepared by prep_gdf, with lat/lon centroid columns.
+    subbasins: gpd.GeoDataFrame
+        The HMS subbasins.
+    pt_ln_layers: list[gpd.GeoDataFrame]
+        The HMS point and line layers (reaches, junctions and reservoirs).
 
     Returns
     -------
-    subbasin_id: str
-        The subbasin ID if a subbasin is found containing the point or line, otherwise None
+    dict
+        Mapping of HMS element ID to its list of gage IDs. Elements without any
+        gages are left out.
     """
-    # Combine all geometries into one (if multiple)
-    _geom = _geom.union_all.centroid
-    # Get all subbasin geometries
-    subbasin_geoms = st.subbasins.geometry
-    # Find which subbasins contain the ln/pt geometry
-    mask = subbasin_geoms.contains(_geom)
-    filtered_gdf = st.subbasins[mask].copy()
-    if filtered_gdf.empty:
-        return None
-    else:
-        return get_gage_from_subbasin(filtered_gdf.geometry)
+    gage_ids = gages["site_no"].to_numpy()
+    subbasin_sindex = subbasins.sindex
+    gage_points = gpd.GeoSeries(gpd.points_from_xy(gages["lon"], gages["lat"]))
+    gage_idx, subbasin_idx = subbasin_sindex.query(gage_points, predicate="within")
+    # Keep the gages in table order within each subbasin
+    order = np.argsort(gage_idx, kind="stable")
+    gages_by_subbasin = {}
+    for gage_pos, subbasin_pos in zip(gage_idx[order], subbasin_idx[order]):
+        gages_by_subbasin.setdefault(subbasin_pos, []).append(gage_pos)
+    subbasin_ids = subbasins["hms_element"].to_numpy()
+    gages_by_element = {
+        subbasin_ids[subbasin_pos]: gage_ids[gage_positions].tolist()
+        for subbasin_pos, gage_positions in gages_by_subbasin.items()
+    }
+    for layer in pt_ln_layers:
+        element_idx, subbasin_idx = subbasin_sindex.query(
+            layer.geometry.centroid, predicate="within"
+        )
+        subbasins_by_element = {}
+        for element_pos, subbasin_pos in zip(element_idx, subbasin_idx):
+            subbasins_by_element.setdefault(element_pos, []).append(subbasin_pos)
+        element_ids = layer["hms_element"].to_numpy()
+        for element_pos, subbasin_positions in subbasins_by_element.items():
+            gage_positions = sorted(
+                {
+                    gage_pos
+                    for subbasin_pos in subbasin_positions
+                    for gage_pos in gages_by_subbasin.get(subbasin_pos, ())
+                }
+            )
+            if gage_positions:
+                element_id = element_ids[element_pos]
+                gages_by_element[element_id] = gage_ids[gage_positions].tolist()
+    return gages_by_element
 
 
 def get_gage_from_ref_ln(ref_id: str):
@@ -1027,7 +1066,7 @@ def focus_feature(
     geom = item.get("geometry", None)
     if geom and isinstance(geom, dict):
         # Convert dict to Geometry object if necessary
-        geom = shape(geom)
+        geom = geojson_to_shape(geom)
     if geom:
         bounds = geom.bounds
         bbox = [[bounds[1], bounds[0]], [bounds[3], bounds[2]]]
@@ -182,30 +182,16 @@ def plot_hist(df: pd.DataFrame, x_col: str, y_col: str, nbins: int):
     return fig
 
 
-def plot_flow_aep(
+@st.cache_data(show_spinner=False, max_entries=16)
+def _build_flow_aep_fig(
     multi_event_ams_df: pd.DataFrame,
     gage_ams_df: Optional[pd.DataFrame] = None,
-):
-    """Function for plotting Discharge Frequency Plot.
+) -> go.Figure:
+    """Build the Discharge Frequency Plot figure for plot_flow_aep.
 
-    Parameters
-    ----------
-    multi_event_ams_df : pd.DataFrame
-        DataFrame containing the multi event AEP, Return Period, and Peak Flow data.
-        - "aep": float
-        - "return_period": float
-        - "peak_flow": float
-    gage_ams_df : Optional[pd.DataFrame]
-        DataFrame containing the gage AEP, Return Period, and Peak Flow data.
-        - "aep": float
-        - "return_period": float
-        - "peak_flow": float
+    The figure is cached on the contents of the two DataFrames so reruns that
+    do not change them skip rebuilding it.
     """
-    # Check if the DataFrames are empty
-    if multi_event_ams_df.empty:
-        st.warning("No data available for the selected variables in the dataset.")
-        return
-
     fig = go.Figure()
 
     # Add trace for AEP vs Peak Flow
@@ -240,7 +226,7 @@ def plot_flow_aep(
                     multi_event_ams_df["aep"],
                     multi_event_ams_df["block_group"],
                     multi_event_ams_df["event_id"],
-                    multi_event_ams_df["storm_id"],
+                    multi_event_ams_df["storm_id"].dt.strftime("%Y-%m-%d"),
                 )
             ],
         )
@@ -277,7 +263,7 @@ def plot_flow_aep(
                         gage_ams_df["return_period"],
                         gage_ams_df["peak_flow"],
                         gage_ams_df["aep"],
-                        gage_ams_df["peak_time"],
+                        gage_ams_df["peak_time"].dt.strftime("%Y-%m-%d"),
                     )
                 ],
             )
@@ -328,6 +314,36 @@ def plot_flow_aep(
     fig.update_yaxes(
         showspikes=True, spikemode="across", spikesnap="cursor", spikethickness=1
     )
+    return fig
+
+
+def plot_flow_aep(
+    multi_event_ams_df: pd.DataFrame,
+    gage_ams_df: Optional[pd.DataFrame] = None,
+):
+    """Function for plotting Discharge Frequency Plot.
+
+    Parameters
+    ----------
+    multi_event_ams_df : pd.DataFrame
+        DataFrame containing the multi event AEP, Return Period, and Peak Flow data.
+        - "aep": float
+        - "return_period": float
+        - "peak_flow": float
+        - "storm_id": datetime
+    gage_ams_df : Optional[pd.DataFrame]
+        DataFrame containing the gage AEP, Return Period, and Peak Flow data.
+        - "aep": float
+        - "return_period": float
+        - "peak_flow": float
+        - "peak_time": datetime
+    """
+    # Check if the DataFrames are empty
+    if multi_event_ams_df.empty:
+        st.warning("No data available for the selected variables in the dataset.")
+        return
+
+    fig = _build_flow_aep_fig(multi_event_ams_df, gage_ams_df)
 
     # Return point selection(s)
     plot_selection = st.plotly_chart(
@@ -359,7 +375,7 @@ def plot_flow_aep(
                 )
                 points_dict[storm_id_fmt]["event_id"] = None
                 points_dict[storm_id_fmt]["storm_id"] = storm_id_fmt
-                points_dict[storm_id_fmt]["peak_time"] = storm_id
+                points_dict[storm_id_fmt]["peak_time"] = storm_id_dt
             else:
                 block_group = (
                     row["text"].split("<br>")[3].split(": ")[1].replace(",", "")
@@ -385,7 +401,7 @@ def plot_flow_aep(
         return None
 
 
-def plot_multi_event_ts(df1: pd.DataFrame, df2: pd.DataFrame):
+def plot_multi_event_ts(df1: pd.DataFrame, df2: pd.DataFrame | None = None):
     """
     Create a multi-trace plot for time series data with multiple events.
 
@@ -396,25 +412,25 @@ def plot_multi_event_ts(df1: pd.DataFrame, df2: pd.DataFrame):
         - "time": datetime
         - "hms_flow": float
         - "block_id": int
-    df2 : pd.DataFrame
+    df2 : pd.DataFrame | None
         DataFrame containing the multi-event time series data for baseflows.
         - "time": datetime
         - "hms_flow": float
         - "block_id": int
+        None if no baseflows are available.
 
     Returns
     -------
     fig : plotly.graph_objects.Figure
     """
+    has_baseflow = df2 is not None and not df2.empty
     # Check if the DataFrame is empty
-    if df1.empty and df2.empty:
+    if df1.empty and not has_baseflow:
         st.warning("No data available for the selected variables in the dataset.")
         return
 
     # Create a figure
     fig = go.Figure()
-    df1["plot_index"] = df1.index
-    df2["plot_index"] = df2.index
 
     if not df1.empty:
         # Add traces for each hydrograph
@@ -423,7 +439,7 @@ def plot_multi_event_ts(df1: pd.DataFrame, df2: pd.DataFrame):
             if "hms_flow" in block_data.columns:
                 fig.add_trace(
                     go.Scatter(
-                        x=block_data["plot_index"],
+                        x=block_data.index,
                         y=block_data["hms_flow"],
                         mode="lines",
                         name=f"Block {block_id}",
@@ -433,7 +449,7 @@ def plot_multi_event_ts(df1: pd.DataFrame, df2: pd.DataFrame):
             elif "obs_flow" in block_data.columns:
                 fig.add_trace(
                     go.Scatter(
-                        x=block_data["plot_index"],
+                        x=block_data.index,
                         y=block_data["obs_flow"],
                         mode="lines",
                         name=f"Observed {block_id}",
@@ -445,14 +461,14 @@ def plot_multi_event_ts(df1: pd.DataFrame, df2: pd.DataFrame):
                     f"No data available for the selected variables in the dataset. {block_id}."
                 )
 
-    if not df2.empty:
+    if has_baseflow:
         # Add traces for baseflows if available
         for block_id in df2["block_id"].unique():
             block_data = df2[df2["block_id"] == block_id]
             if "hms_flow" in block_data.columns:
                 fig.add_trace(
                     go.Scatter(
-                        x=block_data["plot_index"],
+                        x=block_data.index,
                         y=block_data["hms_flow"],
                         mode="lines",
                         name=f"Baseflow Block {block_id}",
@@ -55,6 +55,7 @@ def init_session_state():
     st.session_state["hms_element_id"] = None
     st.session_state["storm_layer"] = None
     st.session_state["current_map_feature"] = None
+    st.session_state["hms_map"] = None
 
     # model qc session
     st.session_state["model_qc_file_path"] = None
@@ -68,12 +69,16 @@ def init_session_state():
     st.gages = None
     st.gage_metadata = None
     st.models = None
+    st.models_by_id = None
     st.bc_lines = None
     st.subbasins = None
     st.reaches = None
     st.junctions = None
     st.reservoirs = None
+    st.subbasin_geom_by_id = None
+    st.gages_by_element = None
     st.hms_storms = None
+    st.hms_storms_by_id = None
     st.study_area = None
     st.transposed_study_area = None
 
@@ -102,6 +107,7 @@ def init_session_state():
     st.session_state["hydromet_storm_date"] = None
     st.session_state["aorc_storm_href"] = None
     st.session_state["storms_df_rank"] = None
+    st.session_state["storms_query_key"] = None
     st.session_state["num_storms"] = None
     st.session_state["hydromet_storm_data"] = None
     st.session_state["hydromet_hyetograph_data"] = None
@@ -116,8 +122,37 @@ def init_session_state():
     st.session_state["storm_animation_storm_id"] = None
     st.session_state["storm_max"] = None
     st.session_state["storm_min"] = None
+    st.session_state["storm_overlay"] = None
     st.session_state["hyeto_cache"] = {}
+    st.session_state["hyeto_df_cache"] = {}
+    st.session_state["hyeto_index"] = {}
+    st.session_state["hyeto_fig"] = None
     st.session_state["storm_cache"] = None
     st.session_state["aorc:statistics"] = None
     st.session_state["aorc:transform:"] = None
     st.session_state["storm_log"] = None
+
+
+def summarize_session_state() -> dict:
+    """
+    Summarize the session state for the debug panel.
+
+    Large objects such as DataFrames and connections are replaced with a short
+    description so the panel does not serialize them on every rerun.
+
+    Returns
+    -------
+    dict
+        A JSON friendly summary of the session state
+    """
+    summary = {}
+    for key, value in st.session_state.items():
+        if value is None or isinstance(value, (bool, int, float, str)):
+            summary[key] = value
+        elif hasattr(value, "shape"):
+            summary[key] = f"<{type(value).__name__} {value.shape}>"
+        elif isinstance(value, (dict, list, tuple, set)):
+            summary[key] = f"<{type(value).__name__} len={len(value)}>"
+        else:
+            summary[key] = f"<{type(value).__name__}>"
+    return summary
@@ -14,6 +14,7 @@ from db.pull import (
     query_s3_hms_storms,
 )
 from db.query_meta_tables import query_study_area, query_transpo_domain
+from utils.mapping import build_gages_by_element
 
 rootDir = os.path.dirname(os.path.abspath(__file__))  # located within utils folder
 srcDir = os.path.abspath(os.path.join(rootDir, ".."))  # go up one level to src
@@ -57,6 +58,7 @@ def reset_selections():
             "hms_element_id": None,
             "hydromet_storm_id": None,
             "storms_df_rank": None,
+            "storms_query_key": None,
             "storms_df_precip": None,
             "storms_df_date": None,
             "num_storms": None,
@@ -74,7 +76,11 @@ def reset_selections():
             "storm_animation_html": None,
             "storm_max": None,
             "storm_min": None,
+            "storm_overlay": None,
             "hyeto_cache": {},
+            "hyeto_df_cache": {},
+            "hyeto_index": {},
+            "hyeto_fig": None,
         }
     )
 
@@ -116,48 +122,88 @@ def prep_gdf(gdf: gpd.GeoDataFrame, layer: str, hms: bool = False) -> gpd.GeoDat
     return gdf
 
 
-def init_hms_pilot(s3_conn, pilot: str):
+@st.cache_resource(show_spinner="Initializing HMS datasets...")
+def _load_hms_pilot(_s3_conn, pilot: str) -> dict:
     """
-    Initialize the map data for the selected HMS pilot study
+    Load the map data for an HMS pilot study once per process
 
     Parameters
     ----------
-    s3_conn: duckdb.DuckDBPyConnection
+    _s3_conn: duckdb.DuckDBPyConnection
         The connection to the S3 account
     pilot: str
-        The name of the pilot study to initialize data for
+        The name of the pilot study to load data for
+
+    Returns
+    -------
+    dict
+        The pilot datasets keyed by the st attribute they are stored under
     """
     if pilot == "trinity-pilot":
-        st.pilot_base_url = f"https://{pilot}.s3.amazonaws.com/stac/prod-support"
-        st.pilot_layers = {
-            "Dams": f"{st.pilot_base_url}/dams/non-usace/non-usace-dams.geojson",
-            "Gages": f"{st.pilot_base_url}/gages/gages.geojson",
-            "Subbasins": f"{st.pilot_base_url}/conformance/hydrology/trinity/assets/Subbasin.geojson",
-            "Reaches": f"{st.pilot_base_url}/conformance/hydrology/trinity/assets/Reach.geojson",
-            "Junctions": f"{st.pilot_base_url}/conformance/hydrology/trinity/assets/Junction.geojson",
-            "Reservoirs": f"{st.pilot_base_url}/conformance/hydrology/trinity/assets/Reservoir.geojson",
+        pilot_base_url = f"https://{pilot}.s3.amazonaws.com/stac/prod-support"
+        pilot_layers = {
+            "Dams": f"{pilot_base_url}/dams/non-usace/non-usace-dams.geojson",
+            "Gages": f"{pilot_base_url}/gages/gages.geojson",
+            "Subbasins": f"{pilot_base_url}/conformance/hydrology/trinity/assets/Subbasin.geojson",
+            "Reaches": f"{pilot_base_url}/conformance/hydrology/trinity/assets/Reach.geojson",
+            "Junctions": f"{pilot_base_url}/conformance/hydrology/trinity/assets/Junction.geojson",
+            "Reservoirs": f"{pilot_base_url}/conformance/hydrology/trinity/assets/Reservoir.geojson",
         }
-        st.cog_layers = {}
-        st.hms_meta_url = (
+        hms_meta_url = (
             "stac-api.arc-apps.net/collections/conformance-models/items/trinity"
         )
     else:
         raise ValueError(f"Error: invalid pilot study {pilot}")
 
-    df_dams = gpd.read_file(st.pilot_layers["Dams"])
-    st.dams = prep_gdf(df_dams, "Dam")
-    df_gages = gpd.read_file(st.pilot_layers["Gages"]).drop_duplicates()
-    st.gages = prep_gdf(df_gages, "Gage")
-    st.hms_storms = query_s3_hms_storms(s3_conn, pilot)
-    df_subbasins = gpd.read_file(st.pilot_layers["Subbasins"])
-    st.subbasins = prep_gdf(df_subbasins, "Subbasin", hms=True)
-    st.subbasins["geometry"] = st.subbasins["geometry"].simplify(tolerance=0.001)
-    df_reaches = gpd.read_file(st.pilot_layers["Reaches"])
-    st.reaches = prep_gdf(df_reaches, "Reach", hms=True)
-    df_junctions = gpd.read_file(st.pilot_layers["Junctions"])
-    st.junctions = prep_gdf(df_junctions, "Junction", hms=True)
-    df_reservoirs = gpd.read_file(st.pilot_layers["Reservoirs"])
-    st.reservoirs = prep_gdf(df_reservoirs, "Reservoir", hms=True)
+    dams = prep_gdf(gpd.read_file(pilot_layers["Dams"]), "Dam")
+    gages = prep_gdf(gpd.read_file(pilot_layers["Gages"]).drop_duplicates(), "Gage")
+    hms_storms = query_s3_hms_storms(_s3_conn, pilot)
+    subbasins = prep_gdf(gpd.read_file(pilot_layers["Subbasins"]), "Subbasin", hms=True)
+    subbasins["geometry"] = subbasins["geometry"].simplify(tolerance=0.001)
+    reaches = prep_gdf(gpd.read_file(pilot_layers["Reaches"]), "Reach", hms=True)
+    junctions = prep_gdf(gpd.read_file(pilot_layers["Junctions"]), "Junction", hms=True)
+    reservoirs = prep_gdf(
+        gpd.read_file(pilot_layers["Reservoirs"]), "Reservoir", hms=True
+    )
+    return {
+        "pilot_base_url": pilot_base_url,
+        "pilot_layers": pilot_layers,
+        "cog_layers": {},
+        "hms_meta_url": hms_meta_url,
+        "dams": dams,
+        "gages": gages,
+        "hms_storms": hms_storms,
+        # Index the storms by event for map lookups. Each event belongs to one
+        # storm, so fail on a repeated event_id instead of picking one of them
+        "hms_storms_by_id": hms_storms.set_index("event_id", verify_integrity=True),
+        "subbasins": subbasins,
+        "reaches": reaches,
+        "junctions": junctions,
+        "reservoirs": reservoirs,
+        # Index subbasin geometries by ID for constant time lookups
+        "subbasin_geom_by_id": dict(zip(subbasins["hms_element"], subbasins.geometry)),
+        "gages_by_element": build_gages_by_element(
+            gages, subbasins, [reaches, junctions, reservoirs]
+        ),
+    }
+
+
+def init_hms_pilot(s3_conn, pilot: str):
+    """
+    Initialize the map data for the selected HMS pilot study
+
+    The datasets are loaded once per process and shared by every session, so
+    calling this on each rerun only rebinds them onto st.
+
+    Parameters
+    ----------
+    s3_conn: duckdb.DuckDBPyConnection
+        The connection to the S3 account
+    pilot: str
+        The name of the pilot study to initialize data for
+    """
+    for name, value in _load_hms_pilot(s3_conn, pilot).items():
+        setattr(st, name, value)
 
 
 def _s3_to_https(s3_path: str) -> str:
@@ -281,6 +327,8 @@ def init_ras_pilot(s3_conn, pilot: str):
     st.gages = prep_gdf(df_gages, "Gage")
     st.models = query_s3_model_bndry(s3_conn, pilot, "all")
     st.models["geometry"] = st.models["geometry"].simplify(tolerance=0.001)
+    # Index the models by ID for hash lookups of the selected model
+    st.models_by_id = st.models.set_index("model", drop=False)
     st.ref_lines = query_s3_ref_lines(s3_conn, pilot, "all")
     st.ref_points = query_s3_ref_points(s3_conn, pilot, "all")
     st.bc_lines = query_s3_bc_lines(s3_conn, pilot, "all")
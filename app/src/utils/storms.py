@@ -116,6 +116,31 @@ def _select_storm_time_window(
     return ds_selected
 
 
+@st.cache_resource(show_spinner=False, validate=lambda ds: ds is not None)
+def _get_ds(bucket: str, prefix: str, branch: str) -> xr.Dataset | None:
+    """Open and cache the Icechunk storm dataset for a repo and branch.
+
+    The opened session is a live handle, so it is shared across reruns and
+    sessions. A failed open returns None, which is never reused from the cache.
+
+    Parameters
+    ----------
+    bucket : str
+        The S3 bucket of the Icechunk repository.
+    prefix : str
+        The prefix of the Icechunk repository within the bucket.
+    branch : str
+        The branch to open a read-only session on.
+
+    Returns
+    -------
+    xr.Dataset | None
+        The opened dataset, or None if the session could not be opened.
+    """
+    repo = open_repo(bucket=bucket, prefix=prefix)
+    return open_session(repo=repo, branch=branch)
+
+
 def compute_storm(
     storm_id: int,
     storm_date: str,
@@ -141,8 +166,7 @@ def compute_storm(
     """
     # split the aorc_storm_href into bucket and prefix
     bucket, prefix = aorc_storm_href.replace("s3://", "").split("/", 1)
-    repo = open_repo(bucket=bucket, prefix=prefix)
-    ds = open_session(repo=repo, branch="main")
+    ds = _get_ds(bucket, prefix, "main")
     last_anim_storm = st.session_state.get("storm_animation_storm_id")
     if last_anim_storm != storm_id:
         st.session_state["storm_animation_payload"] = None
@@ -206,6 +230,49 @@ def compute_storm(
                 st.session_state["storm_log"] = storm_log
 
 
+@st.cache_data(show_spinner=False, max_entries=1024)
+def _load_point_hyetograph(
+    aorc_storm_href: str, storm_date: str, lat: float, lon: float
+) -> xr.DataArray:
+    """
+    Load the precipitation time series nearest a point for a storm.
+
+    Cached across sessions, so a point dropped again for the same storm, by any
+    user or after a pilot switch, skips the Icechunk read.
+
+    Parameters
+    ----------
+    aorc_storm_href: str
+        The icechunk s3 href for the storm to reference.
+    storm_date: str
+        The start date of the storm.
+    lat: float
+        The latitude of the point.
+    lon: float
+        The longitude of the point.
+
+    Returns
+    -------
+    xr.DataArray
+        The point precipitation in inches along the storm's time dimension.
+    """
+    bucket, prefix = aorc_storm_href.replace("s3://", "").split("/", 1)
+    ds = _get_ds(bucket, prefix, "main")
+    ds_storm = _select_storm_time_window(
+        ds,
+        pd.to_datetime(storm_date),
+    )
+    proj_x, proj_y = _project_lonlat_to_dataset(ds_storm, lon, lat)
+    sel_kwargs = {"x": proj_x, "y": proj_y}
+    ds_point = ds_storm.sel(sel_kwargs, method="nearest")
+    if "APCP_surface" not in ds_point:
+        raise ValueError("Dataset does not contain 'APCP_surface' variable.")
+    da_precip = ds_point["APCP_surface"]
+    if "time" not in da_precip.dims:
+        raise ValueError("'APCP_surface' variable does not have 'time' dimension.")
+    return _load_precip_cube(da_precip)
+
+
 def compute_hyetograph(
     storm_id: int,
     storm_date: str,
@@ -231,29 +298,16 @@ def compute_hyetograph(
     """
     if lat is None or lon is None or storm_id is None:
         return
-    bucket, prefix = aorc_storm_href.replace("s3://", "").split("/", 1)
-    repo = open_repo(bucket=bucket, prefix=prefix)
-    ds = open_session(repo=repo, branch="main")
     parent_ctx = tab if tab is not None else nullcontext()
     with parent_ctx:
         with st.spinner(f"Computing hyetograph for point ({lat}, {lon})..."):
-            storm_start = pd.to_datetime(storm_date)
-            ds_storm = _select_storm_time_window(
-                ds,
-                storm_start,
+            precip_point = _load_point_hyetograph(aorc_storm_href, storm_date, lat, lon)
+            cache_key = (lat, lon, storm_id)
+            st.session_state["hyeto_cache"][cache_key] = precip_point
+            st.session_state["hyeto_index"].setdefault(storm_id, []).append(cache_key)
+            st.session_state["hyeto_df_cache"][cache_key] = _hyetograph_frame(
+                precip_point
             )
-            proj_x, proj_y = _project_lonlat_to_dataset(ds_storm, lon, lat)
-            sel_kwargs = {"x": proj_x, "y": proj_y}
-            ds_point = ds_storm.sel(sel_kwargs, method="nearest")
-            if "APCP_surface" not in ds_point:
-                raise ValueError("Dataset does not contain 'APCP_surface' variable.")
-            da_precip = ds_point["APCP_surface"]
-            if "time" not in da_precip.dims:
-                raise ValueError(
-                    "'APCP_surface' variable does not have 'time' dimension."
-                )
-            precip_point = _load_precip_cube(da_precip)
-            st.session_state["hyeto_cache"][(lat, lon, storm_id)] = precip_point
 
 
 def compute_storm_animation(
@@ -282,8 +336,7 @@ def compute_storm_animation(
         return
 
     bucket, prefix = aorc_storm_href.replace("s3://", "").split("/", 1)
-    repo = open_repo(bucket=bucket, prefix=prefix)
-    ds = open_session(repo=repo, branch="main")
+    ds = _get_ds(bucket, prefix, "main")
     storm_start = pd.to_datetime(storm_date)
     ds_storm = _select_storm_time_window(
         ds,
@@ -505,6 +558,21 @@ def _load_precip_cube(da_precip: xr.DataArray) -> xr.DataArray:
     return (da_precip / 1000 * 39.3701).load()
 
 
+def _hyetograph_frame(
+    precip_point: xr.DataArray,
+) -> tuple[pd.DataFrame, str, pd.DataFrame]:
+    """Convert a point hyetograph to plot and table DataFrames and its time column."""
+    hyeto_df = precip_point.to_dataframe(name="precip_in").reset_index()
+    time_cols = [col for col in ("abs_time", "time") if col in hyeto_df.columns]
+    if not time_cols:
+        hyeto_df["timestep"] = range(len(hyeto_df))
+        return hyeto_df, "timestep", hyeto_df
+    x_col = time_cols[0]
+    # Timestamps are formatted for the table once here rather than per rerun
+    display_df = hyeto_df.assign(**{x_col: hyeto_df[x_col].astype(str)})
+    return hyeto_df, x_col, display_df
+
+
 def _animation_payload_from_cube(precip_cube: xr.DataArray) -> dict:
     """Extract frames and times from the precipitation cube for animation."""
     frames = precip_cube.values
@@ -707,7 +775,7 @@ def _frame_to_png_data_url(
         )  # Composite overlay onto base image
 
     buffer = io.BytesIO()  # Save the final image to a bytes buffer in PNG format
-    base_img.save(buffer, format="PNG")  # Save the image to the buffer
+    base_img.save(buffer, format="PNG", optimize=True)  # Smallest lossless encoding
     encoded = base64.b64encode(buffer.getvalue()).decode(
         "ascii"
     )  # Encode the PNG bytes as a base64 string
@@ -0,0 +1,10 @@
+import os
+import sys
+
+testDir = os.path.dirname(
+    os.path.realpath(__file__)
+)  # located within the app/tests folder
+srcDir = os.path.join(testDir, "..", "src")
+
+# The pages import utils and db as top-level packages, as under streamlit run
+sys.path.insert(0, srcDir)
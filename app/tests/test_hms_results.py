@@ -0,0 +1,114 @@
+import pandas as pd
+import pandas.testing as pdt
+
+# Custom imports
+from pages import hms_results
+
+
+def _nwis_frame(site: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Build a NWIS frame with one reading per local day of the window."""
+    days = pd.date_range(start_date, end_date).strftime("%Y-%m-%d")
+    return pd.DataFrame(
+        {
+            "datetime": [f"{day}T12:00:00.000-06:00" for day in days],
+            "site_no": site,
+            "flow": range(len(days)),
+        }
+    )
+
+
+def _patch_query_nwis(monkeypatch) -> list:
+    """Replace query_nwis on the HMS page and return the list of its calls."""
+    calls = []
+
+    def query_nwis(site, parameter, start_date, end_date, data_type, reference_df):
+        calls.append((site, start_date, end_date))
+        return _nwis_frame(site, start_date, end_date)
+
+    monkeypatch.setattr(hms_results, "query_nwis", query_nwis)
+    return calls
+
+
+def test_query_nwis_batched_merges_windows(monkeypatch):
+    """
+    Test that overlapping windows of a gage share one NWIS query.
+    """
+    calls = _patch_query_nwis(monkeypatch)
+    point_flows = hms_results._query_nwis_batched(
+        {
+            "point_1": ("gage_a", "2020-01-01", "2020-01-03"),
+            "point_2": ("gage_a", "2020-01-02", "2020-01-04"),
+            "point_3": ("gage_b", "2020-01-01", "2020-01-03"),
+        }
+    )
+    assert sorted(calls) == [
+        ("gage_a", "2020-01-01", "2020-01-04"),
+        ("gage_b", "2020-01-01", "2020-01-03"),
+    ], "Overlapping windows of the same gage were not merged."
+    combined_df = _nwis_frame("gage_a", "2020-01-01", "2020-01-04")
+    pdt.assert_frame_equal(point_flows["point_1"], combined_df.iloc[0:3])
+    pdt.assert_frame_equal(point_flows["point_2"], combined_df.iloc[1:4])
+    pdt.assert_frame_equal(
+        point_flows["point_3"], _nwis_frame("gage_b", "2020-01-01", "2020-01-03")
+    )
+
+
+def test_query_nwis_batched_separate_windows(monkeypatch):
+    """
+    Test that disjoint windows of a gage are queried separately.
+    """
+    calls = _patch_query_nwis(monkeypatch)
+    point_flows = hms_results._query_nwis_batched(
+        {
+            "point_1": ("gage_a", "2020-01-01", "2020-01-02"),
+            "point_2": ("gage_a", "2020-01-05", "2020-01-06"),
+        }
+    )
+    assert sorted(calls) == [
+        ("gage_a", "2020-01-01", "2020-01-02"),
+        ("gage_a", "2020-01-05", "2020-01-06"),
+    ], "Disjoint windows of the same gage were merged."
+    pdt.assert_frame_equal(
+        point_flows["point_1"], _nwis_frame("gage_a", "2020-01-01", "2020-01-02")
+    )
+    pdt.assert_frame_equal(
+        point_flows["point_2"], _nwis_frame("gage_a", "2020-01-05", "2020-01-06")
+    )
+
+
+def test_concat_frames_empty_and_single():
+    """
+    Test that no frames give None and a single frame is returned as is.
+    """
+    frame = pd.DataFrame({"hms_flow": [1.0, 2.0]})
+    assert hms_results._concat_frames([]) is None
+    assert hms_results._concat_frames([frame]) is frame
+
+
+def test_concat_frames_matches_pd_concat():
+    """
+    Test that the NumPy fast path matches pd.concat for frames sharing a schema.
+    """
+    frames = [
+        pd.DataFrame(
+            {
+                "time": pd.date_range("2020-01-01", periods=size, freq="h"),
+                "hms_flow": [float(i) for i in range(size)],
+                "point_id": f"point_{size}",
+            }
+        )
+        for size in (3, 2, 4)
+    ]
+    pdt.assert_frame_equal(hms_results._concat_frames(frames), pd.concat(frames))
+
+
+def test_concat_frames_mixed_schemas():
+    """
+    Test that frames with differing dtypes fall back to pd.concat.
+    """
+    frames = [
+        pd.DataFrame({"hms_flow": [1, 2]}),
+        pd.DataFrame({"hms_flow": [1.5, 2.5, 3.5]}),
+        pd.DataFrame({"hms_flow": pd.array([4.0], dtype="Float64")}),
+    ]
+    pdt.assert_frame_equal(hms_results._concat_frames(frames), pd.concat(frames))
@@ -0,0 +1,83 @@
+import geopandas as gpd
+from shapely.geometry import LineString, Point, box, shape
+
+# Custom imports
+from src.utils.mapping import build_gages_by_element, geojson_to_shape
+
+
+def _gages(points: dict) -> gpd.GeoDataFrame:
+    """Build a gage layer with the lat/lon centroid columns set by prep_gdf."""
+    return gpd.GeoDataFrame(
+        {
+            "site_no": list(points),
+            "lon": [x for x, _ in points.values()],
+            "lat": [y for _, y in points.values()],
+        },
+        geometry=[Point(xy) for xy in points.values()],
+    )
+
+
+def _elements(geoms: dict) -> gpd.GeoDataFrame:
+    """Build an HMS element layer keyed by hms_element."""
+    return gpd.GeoDataFrame({"hms_element": list(geoms)}, geometry=list(geoms.values()))
+
+
+def test_build_gages_by_element():
+    """
+    Test mapping HMS subbasins, reaches, junctions and reservoirs to their gages.
+    """
+    gages = _gages(
+        {
+            "gage_1": (0.5, 0.5),
+            "gage_3": (1.5, 0.5),
+            "gage_2": (0.25, 0.75),
+            "gage_outside": (5.0, 5.0),
+        }
+    )
+    subbasins = _elements(
+        {
+            "subbasin_1": box(0, 0, 1, 1),
+            "subbasin_2": box(1, 0, 2, 1),
+            "subbasin_no_gage": box(3, 0, 4, 1),
+        }
+    )
+    reaches = _elements({"reach_1": LineString([(0.2, 0.2), (0.8, 0.2)])})
+    junctions = _elements({"junction_2": Point(1.5, 0.8)})
+    reservoirs = _elements(
+        {"reservoir_no_gage": Point(3.5, 0.5), "reservoir_outside": Point(9, 9)}
+    )
+    gages_by_element = build_gages_by_element(
+        gages, subbasins, [reaches, junctions, reservoirs]
+    )
+    # Gages keep their table order, elements without gages are left out
+    assert gages_by_element == {
+        "subbasin_1": ["gage_1", "gage_2"],
+        "subbasin_2": ["gage_3"],
+        "reach_1": ["gage_1", "gage_2"],
+        "junction_2": ["gage_3"],
+    }, "Gages by element do not match the expected mapping."
+
+
+def test_geojson_to_shape():
+    """
+    Test converting GeoJSON geometries, with and without the fast paths, to shapely.
+    """
+    geoms = [
+        {"type": "Point", "coordinates": [-95.1, 30.2]},
+        {"type": "LineString", "coordinates": [[-95.1, 30.2], [-95.0, 30.3]]},
+        {
+            "type": "Polygon",
+            "coordinates": [
+                [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]],
+                [[1, 1], [2, 1], [2, 2], [1, 2], [1, 1]],
+            ],
+        },
+        {"type": "MultiPoint", "coordinates": [[0, 0], [1, 1]]},
+    ]
+    for geom in geoms:
+        result = geojson_to_shape(geom)
+        expected = shape(geom)
+        assert result.geom_type == expected.geom_type, (
+            f"{geom['type']} converted to {result.geom_type}."
+        )
+        assert result.equals(expected), f"{geom['type']} geometry does not match."